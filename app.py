@@ -1,13 +1,12 @@
 import streamlit as st
+import importlib
 import logging
 import os
 import pytz
 import socket
 
-from pages.expenses_page import expenses_page
-from pages.income_page import income_page
-from pages.orders_page import orders_page
-from pages.summary_page import summary_page
+from utils.instrumentation import start_rerun, span, log_rerun, debug_panel
+from utils.global_search import search_box
 from datetime import datetime
 
 @st.cache_resource
@@ -15,18 +14,64 @@ def get_deploy_time():
     return datetime.now(pytz.timezone('Asia/Kolkata')).strftime("%Y-%m-%d %H:%M:%S")
 
 st.sidebar.markdown(f"**Last deployed:** {get_deploy_time()}")
+show_debug = st.sidebar.toggle("Debug panel", key="debug_panel")
+search_slot = st.sidebar.container()
+debug_slot = st.sidebar.container()
+status_slot = st.sidebar.container()
 st.set_page_config(page_title="Finance Tracker", layout="wide")
 
-tabs = st.tabs(["Orders", "Completed Orders", "Expenses", "Summary"])
+stats = start_rerun(measure_bytes=show_debug)
 
-with tabs[0]:
-    orders_page()
+# Tables each page reads; they are fetched concurrently before the page renders.
+PAGE_TABLES = {
+    "Orders": ["orders"],
+    "Completed Orders": ["income"],
+    "Expenses": ["expenses"],
+    "Summary": ["monthly_summary", "expenses", "income"],
+    "Customers": ["orders", "income"],
+}
 
-with tabs[1]:
-    income_page()
 
-with tabs[2]:
-    expenses_page()
+def lazy_page(module, title, **kwargs):
+    """st.Page for pages/<module>.py, imported (with pandas, st_aggrid, ...) the first time it is shown."""
+    def run():
+        with span(f"import.pages.{module}"):
+            page_module = importlib.import_module(f"pages.{module}")
+        getattr(page_module, module)()
+    return st.Page(run, title=title, url_path=module, **kwargs)
 
-with tabs[3]:
-    summary_page()
+
+PAGES = {page.title: page for page in [
+    lazy_page("orders_page", "Orders", default=True),
+    lazy_page("income_page", "Completed Orders"),
+    lazy_page("expenses_page", "Expenses"),
+    lazy_page("summary_page", "Summary"),
+    lazy_page("customers_page", "Customers"),
+]}
+
+# Only the selected page runs (and queries its data) on each rerun.
+page = st.navigation(list(PAGES.values()), position="top")
+with span("search"):
+    search_box(PAGES, search_slot)
+with span(f"page.{page.title}"):
+    with span("import.supabasedbutil"):
+        from supabasedbutil import get_write_queue, load_tables
+    load_tables(PAGE_TABLES[page.title])
+    page.run()
+
+# after the page, so the first render doesn't wait on these checks
+from backends import check_indexes
+writes = get_write_queue().counts()
+if writes["failed"]:
+    status_slot.error(f"{writes['failed']} saved entr{'y' if writes['failed'] == 1 else 'ies'} couldn't reach the database.")
+    if status_slot.button("Retry now"):
+        get_write_queue().retry()
+elif writes["pending"]:
+    status_slot.caption(f"Saving {writes['pending']} entr{'y' if writes['pending'] == 1 else 'ies'}…")
+missing_indexes = check_indexes()
+if missing_indexes:
+    status_slot.warning(f"Missing indexes: {', '.join(missing_indexes)}. Run `python -m migrations upgrade`.")
+
+log_rerun(stats, page.title)
+if show_debug:
+    debug_panel(debug_slot, stats)
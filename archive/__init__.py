@@ -0,0 +1,88 @@
+"""Local Parquet archive of closed periods of expenses and income.
+
+Rows dated on or before the sealed-through date are stored once, as typed
+frames, in one Parquet file per table and month:
+
+    history/manifest.json
+    history/expenses/2024-03.parquet
+    history/income/2024-03.parquet
+
+Files are read memory-mapped, so loading history costs a page-in rather than
+a download and JSON parse. The manifest records the sealed-through date and,
+per month, the row count, amount total and a hash of the ids, which is what
+`python -m archive verify` compares against the database.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ARCHIVE_DIR = Path(os.environ.get("ARCHIVE_DIR", "history"))
+ARCHIVE_TABLES = {"expenses": "expense_id", "income": "income_id"}
+
+
+def _manifest_path():
+    return ARCHIVE_DIR / "manifest.json"
+
+
+def read_manifest():
+    path = _manifest_path()
+    if not path.exists():
+        return {"sealed_through": None, "tables": {}}
+    return json.loads(path.read_text())
+
+
+def sealed_through():
+    """Last archived date as an ISO string, or None when nothing is sealed."""
+    return read_manifest()["sealed_through"]
+
+
+def month_stats(table, df):
+    """{YYYY-MM: {"rows", "amount", "ids"}} for a typed frame; ids is a hash of the sorted keys."""
+    if df.empty:
+        return {}
+    id_col = ARCHIVE_TABLES[table]
+    months = pd.to_datetime(df["date"]).dt.strftime("%Y-%m")
+    stats = {}
+    for month, rows in df.groupby(months):
+        ids = ",".join(map(str, sorted(rows[id_col].tolist())))
+        stats[month] = {
+            "rows": len(rows),
+            "amount": int(rows["amount"].sum()),
+            "ids": hashlib.sha256(ids.encode()).hexdigest()[:16],
+        }
+    return stats
+
+
+def write_period(through, frames):
+    """Archive typed frames ({table: df}) holding every row dated <= through, replacing earlier files."""
+    manifest = {"sealed_through": through, "tables": {}}
+    for table, df in frames.items():
+        folder = ARCHIVE_DIR / table
+        folder.mkdir(parents=True, exist_ok=True)
+        for old in folder.glob("*.parquet"):
+            old.unlink()
+        months = pd.to_datetime(df["date"]).dt.strftime("%Y-%m")
+        for month, rows in df.groupby(months):
+            # write then rename, so a reader never maps a half-written file
+            tmp = folder / f".{month}.parquet.tmp"
+            pq.write_table(pa.Table.from_pandas(rows.reset_index(drop=True), preserve_index=False), tmp)
+            tmp.replace(folder / f"{month}.parquet")
+        manifest["tables"][table] = month_stats(table, df)
+    tmp = _manifest_path().with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2))
+    tmp.replace(_manifest_path())
+    return manifest
+
+
+def read_table(table):
+    """The archived rows of a table as one typed frame (empty when nothing is archived)."""
+    files = sorted((ARCHIVE_DIR / table).glob("*.parquet"))
+    if not files:
+        return pd.DataFrame()
+    parts = [pq.read_table(path, memory_map=True) for path in files]
+    # categorical columns come back as dictionaries that differ per file
+    return pa.concat_tables(parts, promote_options="permissive").to_pandas()
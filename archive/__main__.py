@@ -0,0 +1,63 @@
+"""python -m archive [seal [--through DATE] | verify | status] against the configured DB_BACKEND.
+
+seal archives every expense and income row dated on or before --through
+(YYYY-MM-DD, or YYYY-MM for the end of that month). The default is the end of
+the last closed financial year (31 March). Sealing again re-archives from
+scratch.
+"""
+import argparse
+import json
+import sys
+from datetime import date
+import pandas as pd
+from archive import ARCHIVE_DIR, read_manifest
+
+
+def last_closed_financial_year(today=None):
+    today = today or date.today()
+    year = today.year if today.month > 3 else today.year - 1
+    return date(year, 3, 31).isoformat()
+
+
+def period_end(value):
+    if len(value) == 7:  # YYYY-MM
+        return (pd.Period(value, freq="M").end_time.date()).isoformat()
+    return date.fromisoformat(value).isoformat()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m archive", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    seal = commands.add_parser("seal", help="archive a closed period")
+    seal.add_argument("--through", type=period_end, default=last_closed_financial_year())
+    commands.add_parser("verify", help="check the archive against the database")
+    commands.add_parser("status", help="show what is archived")
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        manifest = read_manifest()
+        print(f"archive: {ARCHIVE_DIR.resolve()}")
+        print(f"sealed through: {manifest['sealed_through'] or 'nothing sealed'}")
+        for table, months in manifest["tables"].items():
+            rows = sum(m["rows"] for m in months.values())
+            print(f"{table:10s} {len(months):4d} months {rows:9d} rows")
+        return 0
+
+    import supabasedbutil as db
+    if args.command == "seal":
+        manifest = db.seal_period(args.through)
+        for table, months in manifest["tables"].items():
+            print(f"{table:10s} {len(months):4d} months {sum(m['rows'] for m in months.values()):9d} rows")
+        print(f"sealed through {args.through}")
+        return 0
+
+    problems = db.verify_archive()
+    for problem in problems:
+        print(json.dumps(problem))
+    print(f"{len(problems)} mismatched month(s)" if problems else "archive matches the database")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Storage backends behind supabasedbutil.
+
+Pick one with the DB_BACKEND setting (environment variable or Streamlit secret):
+  supabase  Supabase REST API (default); needs SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY
+  postgres  pooled direct connection; needs SUPABASE_CONN_STRING
+  sqlite    local file at SQLITE_PATH (default finance.db), created and upgraded from migrations/sqlite
+
+Postgres schema changes live in migrations/postgres; apply them with
+`python -m migrations upgrade`.
+"""
+import os
+import streamlit as st
+
+# seconds check_indexes waits for a direct Postgres connection
+CHECK_CONNECT_TIMEOUT = 5
+
+
+def get_setting(name, default=None):
+    if name in os.environ:
+        return os.environ[name]
+    try:
+        return st.secrets.get(name, default)
+    except FileNotFoundError:
+        # no secrets.toml at all
+        return default
+
+
+def create_backend(kind=None):
+    kind = kind or get_setting("DB_BACKEND", "supabase")
+    if kind == "supabase":
+        from backends.supabase_backend import SupabaseBackend
+        # use Service Role for full CRUD
+        return SupabaseBackend(get_setting("SUPABASE_URL"), get_setting("SUPABASE_SERVICE_ROLE_KEY"))
+    if kind == "postgres":
+        from backends.sql_backend import SqlBackend
+        return SqlBackend.postgres(get_setting("SUPABASE_CONN_STRING"))
+    if kind == "sqlite":
+        from backends.sql_backend import SqlBackend
+        return SqlBackend.sqlite(get_setting("SQLITE_PATH", "finance.db"))
+    raise ValueError(f"Unknown DB_BACKEND {kind!r}; expected supabase, postgres or sqlite")
+
+
+@st.cache_resource
+def get_backend():
+    """One backend (and connection pool) per process."""
+    return create_backend()
+
+
+class LazyBackend:
+    """Stands in for get_backend() and creates it on first use, so importing the data layer doesn't connect."""
+
+    def __getattr__(self, attr):
+        return getattr(get_backend(), attr)
+
+
+@st.cache_resource
+def check_indexes():
+    """Names of expected indexes missing from the database, checked once per process.
+
+    None when the database can't be inspected (Supabase REST without a connection string).
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.exc import SQLAlchemyError
+    from sqlalchemy.pool import NullPool
+    from migrations import missing_indexes
+
+    engine = getattr(get_backend(), "engine", None)
+    if engine is None:
+        url = get_setting("SUPABASE_CONN_STRING")
+        if not url:
+            return None
+        engine = create_engine(url, poolclass=NullPool, connect_args={"connect_timeout": CHECK_CONNECT_TIMEOUT})
+    try:
+        return missing_indexes(engine)
+    except SQLAlchemyError:
+        return None
@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+
+
+class StorageBackend(ABC):
+    """Everything supabasedbutil needs from a database.
+
+    Rows go in and come out as plain dicts holding JSON-style values (ISO date
+    strings, numbers, None), the same shape the Supabase REST API returns.
+    A backend missing any of these methods can't be instantiated.
+    """
+
+    @abstractmethod
+    def insert(self, table, rows):
+        ...
+
+    @abstractmethod
+    def upsert(self, table, rows, key_column):
+        ...
+
+    @abstractmethod
+    def update(self, table, values, key_column, key):
+        ...
+
+    @abstractmethod
+    def delete(self, table, key_column, ids):
+        ...
+
+    @abstractmethod
+    def select_page(self, table, sort_column, id_column, limit, after=None, start=None, end=None):
+        """Up to `limit` rows ordered by (sort_column, id_column) descending,
+        strictly after the (sort value, id) pair `after` when given, and with
+        start <= sort_column <= end for whichever bounds are given."""
+
+    @abstractmethod
+    def select_changes(self, table, id_column, limit, since=None, after=None):
+        """Up to `limit` rows with updated_at >= since (a pandas Timestamp), ordered by
+        (updated_at, id_column) ascending, strictly after the (updated_at, id) pair `after`."""
+
+    @abstractmethod
+    def select_deleted(self, table, since=None):
+        """Tombstones for `table` recorded at or after since: [{"row_id", "deleted_at"}, ...]."""
+
+    @abstractmethod
+    def select_all(self, table, order_column):
+        ...
+
+    @abstractmethod
+    def settle_orders(self, order_ids, payment_method):
+        """Move orders into income and delete them in one transaction; return the count."""
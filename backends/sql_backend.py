@@ -0,0 +1,164 @@
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import bindparam, create_engine, event, text
+from backends.base import StorageBackend
+from migrations import apply_migrations
+
+# Identifiers can't be bound parameters, so only these are ever put into SQL text.
+TABLE_COLUMNS = {
+    "expenses": ["expense_id", "date", "category", "amount", "comment", "updated_at"],
+    "income": ["income_id", "order_id", "date", "customer", "amount", "payment_method", "comment", "updated_at"],
+    "orders": ["order_id", "delivery_date", "customer", "item", "price", "advance", "pending_balance", "description", "delivered", "updated_at"],
+    "monthly_summary": ["month", "total_expense", "total_income"],
+    "deleted_rows": ["table_name", "row_id", "deleted_at"],
+}
+
+def _column(table, column):
+    if column not in TABLE_COLUMNS[table]:
+        raise ValueError(f"Unknown column {table}.{column}")
+    return column
+
+
+def _to_json_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _rows(result):
+    return [{k: _to_json_value(v) for k, v in row.items()} for row in result.mappings()]
+
+
+class SqlBackend(StorageBackend):
+    """Direct SQL through a pooled SQLAlchemy engine (Postgres via psycopg2, or SQLite).
+
+    Multi-row writes go through executemany, and SQLAlchemy caches the
+    compiled form of each statement, so repeated calls skip re-compilation.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.is_sqlite = engine.dialect.name == "sqlite"
+
+    @classmethod
+    def postgres(cls, url, pool_size=5):
+        engine = create_engine(url, pool_size=pool_size, max_overflow=pool_size, pool_pre_ping=True)
+        return cls(engine)
+
+    @classmethod
+    def sqlite(cls, path):
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+        @event.listens_for(engine, "connect")
+        def _pragmas(dbapi_conn, _):
+            dbapi_conn.execute("PRAGMA journal_mode=WAL")
+            dbapi_conn.execute("PRAGMA foreign_keys=ON")
+
+        # a local file is ours to create and keep current
+        apply_migrations(engine)
+        return cls(engine)
+
+    def insert(self, table, rows):
+        if not rows:
+            return
+        columns = [_column(table, c) for c in rows[0]]
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)})"
+        with self.engine.begin() as conn:
+            conn.execute(text(sql), rows)
+
+    def upsert(self, table, rows, key_column):
+        # rows with the same set of columns share one executemany
+        groups = {}
+        for row in rows:
+            groups.setdefault(tuple(row), []).append(row)
+        with self.engine.begin() as conn:
+            for columns, group in groups.items():
+                columns = [_column(table, c) for c in columns]
+                key = _column(table, key_column)
+                updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != key)
+                sql = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)}) "
+                       f"ON CONFLICT ({key}) DO " + (f"UPDATE SET {updates}" if updates else "NOTHING"))
+                conn.execute(text(sql), group)
+
+    def update(self, table, values, key_column, key):
+        sets = ", ".join(f"{_column(table, c)} = :{c}" for c in values)
+        sql = f"UPDATE {table} SET {sets} WHERE {_column(table, key_column)} = :_key"
+        with self.engine.begin() as conn:
+            conn.execute(text(sql), {**values, "_key": key})
+
+    def delete(self, table, key_column, ids):
+        sql = text(f"DELETE FROM {table} WHERE {_column(table, key_column)} IN :_ids")
+        with self.engine.begin() as conn:
+            conn.execute(sql.bindparams(bindparam("_ids", expanding=True)), {"_ids": list(ids)})
+
+    def select_page(self, table, sort_column, id_column, limit, after=None, start=None, end=None):
+        sort, ident = _column(table, sort_column), _column(table, id_column)
+        conditions = []
+        params = {"_limit": limit}
+        if after is not None:
+            conditions.append(f"({sort} < :_sort OR ({sort} = :_sort AND {ident} < :_id))")
+            params.update(_sort=after[0], _id=after[1])
+        if start is not None:
+            conditions.append(f"{sort} >= :_start")
+            params["_start"] = start
+        if end is not None:
+            conditions.append(f"{sort} <= :_end")
+            params["_end"] = end
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        sql = f"SELECT * FROM {table} {where} ORDER BY {sort} DESC, {ident} DESC LIMIT :_limit"
+        with self.engine.connect() as conn:
+            return _rows(conn.execute(text(sql), params))
+
+    def _timestamp(self, ts):
+        # SQLite keeps timestamps as UTC text in strftime('%Y-%m-%d %H:%M:%f') form
+        if self.is_sqlite:
+            return ts.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        return ts.to_pydatetime()
+
+    def select_changes(self, table, id_column, limit, since=None, after=None):
+        ident = _column(table, id_column)
+        conditions = []
+        params = {"_limit": limit}
+        if since is not None:
+            conditions.append("updated_at >= :_since")
+            params["_since"] = self._timestamp(since)
+        if after is not None:
+            conditions.append(f"(updated_at > :_at OR (updated_at = :_at AND {ident} > :_id))")
+            params.update(_at=after[0], _id=after[1])
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        sql = f"SELECT * FROM {table} {where} ORDER BY updated_at, {ident} LIMIT :_limit"
+        with self.engine.connect() as conn:
+            return _rows(conn.execute(text(sql), params))
+
+    def select_deleted(self, table, since=None):
+        sql = "SELECT row_id, deleted_at FROM deleted_rows WHERE table_name = :_table"
+        params = {"_table": table}
+        if since is not None:
+            sql += " AND deleted_at >= :_since"
+            params["_since"] = self._timestamp(since)
+        with self.engine.connect() as conn:
+            return _rows(conn.execute(text(sql), params))
+
+    def select_all(self, table, order_column):
+        sql = f"SELECT * FROM {table} ORDER BY {_column(table, order_column)}"
+        with self.engine.connect() as conn:
+            return _rows(conn.execute(text(sql)))
+
+    def settle_orders(self, order_ids, payment_method):
+        if not self.is_sqlite:
+            with self.engine.begin() as conn:
+                return conn.execute(text("SELECT settle_orders(:ids, :pm)"), {"ids": order_ids, "pm": payment_method}).scalar()
+
+        # SQLite has no stored functions: same two statements, one transaction
+        ids = bindparam("ids", expanding=True)
+        move = text(
+            "INSERT INTO income (order_id, date, customer, amount, payment_method, comment) "
+            "SELECT order_id, delivery_date, customer, price, :pm, description "
+            "FROM orders WHERE order_id IN :ids"
+        ).bindparams(ids)
+        remove = text("DELETE FROM orders WHERE order_id IN :ids").bindparams(ids)
+        with self.engine.begin() as conn:
+            conn.execute(move, {"ids": order_ids, "pm": payment_method})
+            return conn.execute(remove, {"ids": order_ids}).rowcount
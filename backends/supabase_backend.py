@@ -0,0 +1,60 @@
+from supabase import create_client
+from backends.base import StorageBackend
+
+
+class SupabaseBackend(StorageBackend):
+    """Supabase REST (PostgREST) client."""
+
+    def __init__(self, url, key):
+        self.client = create_client(url, key)
+
+    def insert(self, table, rows):
+        self.client.table(table).insert(rows).execute()
+
+    def upsert(self, table, rows, key_column):
+        self.client.table(table).upsert(rows, on_conflict=key_column).execute()
+
+    def update(self, table, values, key_column, key):
+        self.client.table(table).update(values).eq(key_column, key).execute()
+
+    def delete(self, table, key_column, ids):
+        self.client.table(table).delete().in_(key_column, ids).execute()
+
+    def select_page(self, table, sort_column, id_column, limit, after=None, start=None, end=None):
+        query = (self.client.table(table).select("*")
+                 .order(sort_column, desc=True)
+                 .order(id_column, desc=True)
+                 .limit(limit))
+        if start is not None:
+            query = query.gte(sort_column, start)
+        if end is not None:
+            query = query.lte(sort_column, end)
+        if after is not None:
+            last_sort, last_id = after
+            query = query.or_(f"{sort_column}.lt.{last_sort},and({sort_column}.eq.{last_sort},{id_column}.lt.{last_id})")
+        return query.execute().data
+
+    def select_changes(self, table, id_column, limit, since=None, after=None):
+        query = (self.client.table(table).select("*")
+                 .order("updated_at")
+                 .order(id_column)
+                 .limit(limit))
+        if since is not None:
+            query = query.gte("updated_at", since.isoformat())
+        if after is not None:
+            last_at, last_id = after
+            query = query.or_(f'updated_at.gt."{last_at}",and(updated_at.eq."{last_at}",{id_column}.gt.{last_id})')
+        return query.execute().data
+
+    def select_deleted(self, table, since=None):
+        query = self.client.table("deleted_rows").select("row_id, deleted_at").eq("table_name", table)
+        if since is not None:
+            query = query.gte("deleted_at", since.isoformat())
+        return query.execute().data
+
+    def select_all(self, table, order_column):
+        return self.client.table(table).select("*").order(order_column).execute().data
+
+    def settle_orders(self, order_ids, payment_method):
+        res = self.client.rpc("settle_orders", {"p_order_ids": order_ids, "p_payment_method": payment_method}).execute()
+        return res.data or 0
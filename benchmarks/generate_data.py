@@ -0,0 +1,80 @@
+"""Synthetic expenses, income and orders for benchmarking against a local SQLite database."""
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+
+CATEGORIES = ["Flour", "Sugar", "Butter", "Eggs", "Cream", "Chocolate", "Packaging",
+              "Gas", "Electricity", "Rent", "Transport", "Equipment", "Marketing", "Misc"]
+ITEMS = ["Chocolate Cake", "Red Velvet Cake", "Cheesecake", "Cupcakes", "Brownies",
+         "Cookies", "Fruit Tart", "Black Forest Cake", "Pineapple Cake", "Macarons"]
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya",
+               "Rahul", "Meera", "Karan", "Isha", "Aditya", "Pooja", "Nikhil", "Divya"]
+LAST_NAMES = ["Sharma", "Gupta", "Patel", "Iyer", "Reddy", "Singh", "Mehta", "Nair",
+              "Joshi", "Kapoor", "Rao", "Verma"]
+PAYMENT_METHODS = ["UPI", "Cash", "Card", "Other"]
+HISTORY_DAYS = 3 * 365
+
+
+def _dates(rng, n, start, days):
+    offsets = rng.integers(0, days, n)
+    return (pd.Timestamp(start) + pd.to_timedelta(offsets, unit="D")).strftime("%Y-%m-%d")
+
+
+def _money(rng, n, median, spread=0.6):
+    return np.round(rng.lognormal(np.log(median), spread, n), 2)
+
+
+def _customers(rng, n):
+    first = rng.choice(FIRST_NAMES, n)
+    last = rng.choice(LAST_NAMES, n)
+    return pd.Series(first).str.cat(pd.Series(last), sep=" ")
+
+
+def make_expenses(rng, n, today):
+    return pd.DataFrame({
+        "date": _dates(rng, n, today - timedelta(days=HISTORY_DAYS), HISTORY_DAYS),
+        "category": rng.choice(CATEGORIES, n),
+        "amount": _money(rng, n, 800),
+        "comment": np.where(rng.random(n) < 0.5, "bulk purchase", None),
+    })
+
+
+def make_income(rng, n, today):
+    return pd.DataFrame({
+        "order_id": rng.integers(1, max(n, 1) * 2, n),
+        "date": _dates(rng, n, today - timedelta(days=HISTORY_DAYS), HISTORY_DAYS),
+        "customer": _customers(rng, n),
+        "amount": _money(rng, n, 1500),
+        "payment_method": rng.choice(PAYMENT_METHODS, n, p=[0.6, 0.25, 0.1, 0.05]),
+        "comment": rng.choice(ITEMS, n),
+    })
+
+
+def make_orders(rng, n, today):
+    price = _money(rng, n, 1500)
+    advance = np.round(price * rng.choice([0, 0.25, 0.5], n), 2)
+    return pd.DataFrame({
+        # mostly upcoming, some overdue
+        "delivery_date": _dates(rng, n, today - timedelta(days=30), 90),
+        "customer": _customers(rng, n),
+        "item": rng.choice(ITEMS, n),
+        "price": price,
+        "advance": advance,
+        "pending_balance": np.round(price - advance, 2),
+        "description": "Happy birthday message",
+        "delivered": False,
+    })
+
+
+def generate(backend, rows, seed=0, chunk_size=5000):
+    """Fill a backend with `rows` expenses, income rows and orders each."""
+    rng = np.random.default_rng(seed)
+    today = date.today()
+    for table, make in [("expenses", make_expenses), ("income", make_income), ("orders", make_orders)]:
+        df = make(rng, rows, today)
+        # last touched when entered, not all just now, so delta syncs see realistic change volumes
+        entered = df["delivery_date"] if table == "orders" else df["date"]
+        df["updated_at"] = np.minimum(entered, today.isoformat()) + " 12:00:00.000"
+        records = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+        for start in range(0, len(records), chunk_size):
+            backend.insert(table, records[start:start + chunk_size])
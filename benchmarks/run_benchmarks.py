@@ -0,0 +1,179 @@
+"""Time the data layer and pages against synthetic data in a local SQLite database.
+
+    python -m benchmarks.run_benchmarks --sizes 1000 10000 100000
+
+Each size gets a fresh database in a temp directory. Results are written as
+JSON to benchmarks/results/ so runs from different commits can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# must be set before supabasedbutil creates its backend
+os.environ.setdefault("DB_BACKEND", "sqlite")
+os.environ.setdefault("SQLITE_PATH", os.path.join(tempfile.gettempdir(), "finance_bench_import.db"))
+# no sealed history unless a benchmark seals some itself
+os.environ.setdefault("ARCHIVE_DIR", os.path.join(tempfile.gettempdir(), "finance_bench_archive"))
+# keep the write-behind journal out of the working tree
+os.environ.setdefault("WRITE_JOURNAL_PATH", os.path.join(tempfile.gettempdir(), "finance_bench_pending_writes.db"))
+sys.path.insert(0, str(ROOT))
+
+import supabasedbutil as db
+from backends.sql_backend import SqlBackend
+from benchmarks.generate_data import generate
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"median_s": statistics.median(times), "min_s": min(times), "runs": repeat}
+
+
+def cold(fn):
+    """Run fn with an empty read cache and no local table copies."""
+    def run():
+        db.clear_read_cache()
+        db.reset_sync_state()
+        fn()
+    return run
+
+
+def after_write(table, fn):
+    """Run fn after a (simulated) write to table, so reads take the delta-sync path."""
+    def run():
+        db.bump_table_version(table)
+        fn()
+    return run
+
+
+def bench_data_layer(repeat):
+    results = {}
+    for table, getter in [("expenses", db.get_expenses), ("income", db.get_income), ("orders", db.get_orders)]:
+        results[f"get_{table}_cold"] = timed(cold(getter), repeat)
+        results[f"get_{table}_warm"] = timed(getter, repeat)
+        results[f"get_{table}_delta"] = timed(after_write(table, getter), repeat)
+    results["get_expenses_window_cold"] = timed(cold(lambda: db.get_expenses(limit=250)), repeat)
+    results["get_monthly_summary_cold"] = timed(cold(db.get_monthly_summary), repeat)
+
+    edited = db.encode_frame("expenses", db.get_expenses().head(100))
+    edited["amount"] = edited["amount"] + 1
+    results["save_expenses_100_rows"] = timed(lambda: db.save_expenses(edited), repeat)
+    edited_income = db.encode_frame("income", db.get_income().head(100))
+    results["save_income_100_rows"] = timed(lambda: db.save_income(edited_income), repeat)
+    return results
+
+
+def bench_grid_prep(repeat):
+    from pages.expenses_page import get_grid_options_builder
+    from utils.aggrid_utils import changed_rows
+    from utils.dates import to_display
+
+    df = db.encode_frame("expenses", db.get_expenses())[["expense_id", "date", "category", "amount", "comment"]]
+
+    def prepare():
+        shown = df.copy()
+        shown["date"] = to_display(shown["date"])
+        get_grid_options_builder(shown).build()
+        changed_rows(shown, shown, "expense_id")
+
+    return {"editable_grid_prepare": timed(prepare, repeat)}
+
+
+def bench_summary(repeat):
+    import pandas as pd
+
+    def client_side():
+        # what summary_page did before the server-side rollup
+        for table in ["expenses", "income"]:
+            df = db.get_expenses() if table == "expenses" else db.get_income()
+            months = pd.to_datetime(df["date"]).dt.to_period("M")
+            df["amount"].groupby(months).sum()
+
+    return {
+        "summary_rollup_cold": timed(cold(db.get_monthly_summary), repeat),
+        "summary_client_groupby_warm": timed(client_side, repeat),
+    }
+
+
+def bench_app(repeat):
+    from streamlit.testing.v1 import AppTest
+
+    def render():
+        at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=300)
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+
+    return {"app_render_cold": timed(cold(render), repeat), "app_render_warm": timed(render, repeat)}
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, repeat, skip_app=False):
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sizes": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            print(f"--- {size} rows per table ---")
+            backend = SqlBackend.sqlite(os.path.join(tmp, f"bench_{size}.db"))
+            start = time.perf_counter()
+            generate(backend, size)
+            print(f"generated in {time.perf_counter() - start:.1f}s")
+
+            db.backend = backend
+            db.clear_read_cache()
+            db.reset_sync_state()
+            results = {}
+            results.update(bench_data_layer(repeat))
+            results.update(bench_grid_prep(repeat))
+            results.update(bench_summary(repeat))
+            if not skip_app:
+                results.update(bench_app(repeat))
+            for name, r in results.items():
+                print(f"{name:32s} median {r['median_s'] * 1000:9.1f} ms")
+            results["cache"] = db.cache_stats()
+            report["sizes"][str(size)] = results
+            backend.engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-app", action="store_true", help="don't render app.py through AppTest")
+    parser.add_argument("--out", type=Path, help="output JSON path (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.repeat, args.skip_app)
+    out = args.out or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, default=str))
+    print(f"results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
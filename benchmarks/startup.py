@@ -0,0 +1,126 @@
+"""Measure cold-start cost: imports per page module and initialization per component.
+
+    python -m benchmarks.startup
+
+Each measurement runs in a fresh interpreter, so nothing is already imported
+or cached. Imports are timed with `python -X importtime`, after streamlit
+itself is loaded, and show what showing that page for the first time adds.
+Initialization times backend creation (against a temporary SQLite file
+unless DB_BACKEND is set), the write-behind journal and the first query.
+Results are written as JSON to benchmarks/results/.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+MODULES = ["supabasedbutil", "pages.orders_page", "pages.income_page", "pages.expenses_page",
+           "pages.summary_page", "pages.customers_page", "backends.sql_backend", "backends.supabase_backend"]
+TOP_MODULES = 8
+
+_INIT_SCRIPT = """
+import json, time
+timings = {}
+def timed(name, fn):
+    start = time.perf_counter()
+    value = fn()
+    timings[name] = (time.perf_counter() - start) * 1000
+    return value
+import streamlit
+db = timed("import supabasedbutil", lambda: __import__("supabasedbutil"))
+from backends import create_backend
+db.backend = timed("create backend", create_backend)
+timed("open write journal", db.get_write_queue)
+timed("first query (orders)", db.get_orders)
+timed("second query (orders)", db.get_orders)
+print(json.dumps(timings))
+"""
+
+
+def _env(tmp):
+    env = dict(os.environ)
+    env.setdefault("DB_BACKEND", "sqlite")
+    env.setdefault("SQLITE_PATH", os.path.join(tmp, "startup.db"))
+    env.setdefault("WRITE_JOURNAL_PATH", os.path.join(tmp, "startup_journal.db"))
+    env.setdefault("ARCHIVE_DIR", os.path.join(tmp, "history"))
+    env.setdefault("PERF_LOG_LEVEL", "WARNING")
+    return env
+
+
+def parse_importtime(stderr):
+    """`-X importtime` output -> {module: (self_ms, cumulative_ms)}."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+    return modules
+
+
+def import_cost(module, env):
+    """Milliseconds to import module in a fresh interpreter that already has streamlit, plus its heaviest imports."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import streamlit; import {module}"],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode:
+        return {"error": proc.stderr.strip().splitlines()[-1]}
+    # -X importtime prints a package after its submodules, so everything past
+    # the streamlit line was imported on behalf of module
+    start = proc.stderr.find("| streamlit\n")
+    after = parse_importtime(proc.stderr[start:] if start >= 0 else proc.stderr)
+    heaviest = sorted(after.items(), key=lambda item: item[1][0], reverse=True)[:TOP_MODULES]
+    return {
+        "cumulative_ms": after.get(module, (0, 0))[1],
+        "heaviest": [{"module": name, "self_ms": self_ms} for name, (self_ms, _) in heaviest],
+    }
+
+
+def init_cost(env):
+    proc = subprocess.run([sys.executable, "-c", _INIT_SCRIPT], cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode:
+        return {"error": proc.stderr.strip().splitlines()[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(modules):
+    report = {"timestamp": datetime.now().isoformat(timespec="seconds"), "imports": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _env(tmp)
+        print("--- imports (after streamlit) ---")
+        for module in modules:
+            result = report["imports"][module] = import_cost(module, env)
+            if "error" in result:
+                print(f"{module:32s} failed: {result['error']}")
+                continue
+            heaviest = ", ".join(f"{m['module']} {m['self_ms']:.0f}" for m in result["heaviest"][:3])
+            print(f"{module:32s} {result['cumulative_ms']:9.1f} ms   ({heaviest})")
+
+        print("--- initialization ---")
+        report["init"] = init_cost(env)
+        for name, ms in report["init"].items():
+            print(f"{name:32s} {ms:9.1f} ms" if isinstance(ms, float) else f"{name:32s} {ms}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=MODULES, help="modules to time (default: the app's pages and data layer)")
+    parser.add_argument("--out", type=Path, help="output JSON path (default: benchmarks/results/startup-<timestamp>.json)")
+    args = parser.parse_args()
+
+    report = run(args.modules)
+    out = args.out or RESULTS_DIR / f"startup-{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Versioned schema migrations for the Postgres (Supabase) and SQLite databases.
+
+Each dialect has a folder of numbered .sql files; a file runs once, in its own
+transaction, and is recorded in schema_migrations.  The files themselves are
+written to be re-runnable (IF NOT EXISTS / OR REPLACE), so databases created
+from the old DBSchema.txt dump upgrade cleanly.
+
+    python -m migrations upgrade   # apply pending files
+    python -m migrations status    # list applied / pending
+    python -m migrations verify    # check the indexes the app relies on
+"""
+from pathlib import Path
+from sqlalchemy import text
+
+MIGRATIONS_DIR = Path(__file__).parent
+
+# Indexes behind the app's access paths: keyset paging by (date, id) and
+# delta sync by updated_at.
+EXPECTED_INDEXES = {
+    "expenses": ["expenses_date_id", "expenses_updated_at"],
+    "income": ["income_date_id", "income_updated_at"],
+    "orders": ["orders_delivery_date_id", "orders_updated_at"],
+}
+
+# arbitrary key so two app instances never migrate at the same time
+_PG_LOCK_ID = 7_301_016
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version TEXT PRIMARY KEY,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def _dialect(engine):
+    name = engine.dialect.name
+    if name == "postgresql":
+        return "postgres"
+    if name == "sqlite":
+        return "sqlite"
+    raise ValueError(f"No migrations for {name} databases")
+
+
+def migration_files(engine):
+    """(version, path) pairs for the engine's dialect, in order."""
+    folder = MIGRATIONS_DIR / _dialect(engine)
+    return [(path.stem, path) for path in sorted(folder.glob("*.sql"))]
+
+
+def applied_versions(engine):
+    with engine.begin() as conn:
+        conn.execute(text(_CREATE_TABLE))
+        return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def pending_migrations(engine):
+    applied = applied_versions(engine)
+    return [(version, path) for version, path in migration_files(engine) if version not in applied]
+
+
+def _run_file(engine, version, sql):
+    # The files hold several statements (and $$-quoted function bodies), so they
+    # go through the driver directly rather than SQLAlchemy's text().
+    raw = engine.raw_connection()
+    try:
+        if engine.dialect.name == "sqlite":
+            escaped = version.replace("'", "''")
+            raw.driver_connection.executescript(
+                f"BEGIN;\n{sql}\nINSERT INTO schema_migrations (version) VALUES ('{escaped}');\nCOMMIT;")
+        else:
+            with raw.cursor() as cur:
+                # no parameters, so psycopg2 leaves any % in the SQL alone
+                cur.execute(sql)
+                cur.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+            raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+
+def apply_migrations(engine):
+    """Apply pending migrations in order; returns the versions applied."""
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as lock_conn:
+            lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": _PG_LOCK_ID})
+            try:
+                return _apply_pending(engine)
+            finally:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": _PG_LOCK_ID})
+                lock_conn.commit()
+    return _apply_pending(engine)
+
+
+def _apply_pending(engine):
+    applied = []
+    for version, path in pending_migrations(engine):
+        _run_file(engine, version, path.read_text())
+        applied.append(version)
+    return applied
+
+
+def existing_indexes(engine):
+    """Index names present on the app's tables."""
+    if engine.dialect.name == "sqlite":
+        sql = "SELECT name FROM sqlite_master WHERE type = 'index'"
+    else:
+        sql = "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()"
+    with engine.connect() as conn:
+        return {row[0] for row in conn.execute(text(sql))}
+
+
+def missing_indexes(engine):
+    present = existing_indexes(engine)
+    return [name for names in EXPECTED_INDEXES.values() for name in names if name not in present]
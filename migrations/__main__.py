@@ -0,0 +1,40 @@
+"""python -m migrations [upgrade|status|verify] against the configured DB_BACKEND.
+
+Supabase databases are reached through SUPABASE_CONN_STRING, since the REST
+API can't run DDL.
+"""
+import sys
+from sqlalchemy import create_engine
+from backends import get_setting
+from migrations import apply_migrations, applied_versions, migration_files, missing_indexes
+
+
+def _engine():
+    if get_setting("DB_BACKEND", "supabase") == "sqlite":
+        return create_engine(f"sqlite:///{get_setting('SQLITE_PATH', 'finance.db')}")
+    url = get_setting("SUPABASE_CONN_STRING")
+    if not url:
+        sys.exit("Set SUPABASE_CONN_STRING to migrate the Postgres database")
+    return create_engine(url)
+
+
+def main(command="upgrade"):
+    engine = _engine()
+    if command == "upgrade":
+        applied = apply_migrations(engine)
+        print("\n".join(f"applied {v}" for v in applied) or "up to date")
+    elif command == "status":
+        done = applied_versions(engine)
+        for version, _ in migration_files(engine):
+            print(f"{'applied' if version in done else 'pending'}  {version}")
+    elif command == "verify":
+        missing = missing_indexes(engine)
+        print("missing indexes: " + ", ".join(missing) if missing else "all expected indexes present")
+        return 1 if missing else 0
+    else:
+        sys.exit(f"Unknown command {command!r}; expected upgrade, status or verify")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:2]))
@@ -0,0 +1,68 @@
+-- ========================
+-- Monthly Summary (rollup)
+-- ========================
+-- One row per month, kept up to date by the triggers below so the Summary
+-- tab reads a few dozen rows instead of every expense and income row.
+CREATE TABLE IF NOT EXISTS monthly_summary (
+    month DATE PRIMARY KEY,                          -- first day of the month
+    total_expense NUMERIC(14,2) NOT NULL DEFAULT 0,  -- sum of expenses.amount
+    total_income NUMERIC(14,2) NOT NULL DEFAULT 0    -- sum of income.amount
+);
+
+CREATE OR REPLACE FUNCTION apply_monthly_summary(p_date DATE, p_expense NUMERIC, p_income NUMERIC)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO monthly_summary (month, total_expense, total_income)
+    VALUES (date_trunc('month', p_date)::date, p_expense, p_income)
+    ON CONFLICT (month) DO UPDATE
+    SET total_expense = monthly_summary.total_expense + EXCLUDED.total_expense,
+        total_income = monthly_summary.total_income + EXCLUDED.total_income;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION expenses_monthly_summary() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_monthly_summary(OLD.date, -OLD.amount, 0);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_monthly_summary(NEW.date, NEW.amount, 0);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION income_monthly_summary() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_monthly_summary(OLD.date, 0, -OLD.amount);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_monthly_summary(NEW.date, 0, NEW.amount);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS expenses_monthly_summary ON expenses;
+CREATE TRIGGER expenses_monthly_summary
+    AFTER INSERT OR UPDATE OF date, amount OR DELETE ON expenses
+    FOR EACH ROW EXECUTE FUNCTION expenses_monthly_summary();
+
+DROP TRIGGER IF EXISTS income_monthly_summary ON income;
+CREATE TRIGGER income_monthly_summary
+    AFTER INSERT OR UPDATE OF date, amount OR DELETE ON income
+    FOR EACH ROW EXECUTE FUNCTION income_monthly_summary();
+
+-- Backfill once from existing rows (safe to re-run)
+INSERT INTO monthly_summary (month, total_expense, total_income)
+SELECT month, SUM(total_expense), SUM(total_income)
+FROM (
+    SELECT date_trunc('month', date)::date AS month, amount AS total_expense, 0 AS total_income FROM expenses
+    UNION ALL
+    SELECT date_trunc('month', date)::date, 0, amount FROM income
+) t
+GROUP BY month
+ON CONFLICT (month) DO UPDATE
+SET total_expense = EXCLUDED.total_expense,
+    total_income = EXCLUDED.total_income;
@@ -0,0 +1,23 @@
+-- ========================
+-- Settle Orders (RPC)
+-- ========================
+-- Moves paid orders into income and removes them from orders in a single
+-- transaction. Called as supabase.rpc("settle_orders", ...); returns the
+-- number of orders settled.
+CREATE OR REPLACE FUNCTION settle_orders(p_order_ids INT[], p_payment_method TEXT DEFAULT 'UPI')
+RETURNS INT AS $$
+DECLARE
+    settled INT;
+BEGIN
+    WITH moved AS (
+        DELETE FROM orders
+        WHERE order_id = ANY(p_order_ids)
+        RETURNING order_id, delivery_date, customer, price, description
+    )
+    INSERT INTO income (order_id, date, customer, amount, payment_method, comment)
+    SELECT order_id, delivery_date, customer, price, p_payment_method, description
+    FROM moved;
+    GET DIAGNOSTICS settled = ROW_COUNT;
+    RETURN settled;
+END;
+$$ LANGUAGE plpgsql;
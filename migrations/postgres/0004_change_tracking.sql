@@ -0,0 +1,59 @@
+-- ========================
+-- Change Tracking (delta sync)
+-- ========================
+-- updated_at is bumped on every write and deletes leave a tombstone in
+-- deleted_rows, so clients can fetch only what changed since their last sync.
+ALTER TABLE expenses ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE income ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE orders ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS expenses_updated_at ON expenses (updated_at, expense_id);
+CREATE INDEX IF NOT EXISTS income_updated_at ON income (updated_at, income_id);
+CREATE INDEX IF NOT EXISTS orders_updated_at ON orders (updated_at, order_id);
+
+CREATE TABLE IF NOT EXISTS deleted_rows (
+    table_name VARCHAR(50) NOT NULL,                 -- expenses / income / orders
+    row_id INT NOT NULL,                             -- primary key of the deleted row
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS deleted_rows_table_deleted_at ON deleted_rows (table_name, deleted_at);
+
+CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- TG_ARGV[0] is the primary key column of the table the trigger is on
+CREATE OR REPLACE FUNCTION record_deleted_row() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO deleted_rows (table_name, row_id)
+    VALUES (TG_TABLE_NAME, (to_jsonb(OLD) ->> TG_ARGV[0])::int);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS expenses_touch_updated_at ON expenses;
+CREATE TRIGGER expenses_touch_updated_at BEFORE UPDATE ON expenses
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+DROP TRIGGER IF EXISTS income_touch_updated_at ON income;
+CREATE TRIGGER income_touch_updated_at BEFORE UPDATE ON income
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+DROP TRIGGER IF EXISTS orders_touch_updated_at ON orders;
+CREATE TRIGGER orders_touch_updated_at BEFORE UPDATE ON orders
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+DROP TRIGGER IF EXISTS expenses_record_deleted ON expenses;
+CREATE TRIGGER expenses_record_deleted AFTER DELETE ON expenses
+    FOR EACH ROW EXECUTE FUNCTION record_deleted_row('expense_id');
+DROP TRIGGER IF EXISTS income_record_deleted ON income;
+CREATE TRIGGER income_record_deleted AFTER DELETE ON income
+    FOR EACH ROW EXECUTE FUNCTION record_deleted_row('income_id');
+DROP TRIGGER IF EXISTS orders_record_deleted ON orders;
+CREATE TRIGGER orders_record_deleted AFTER DELETE ON orders
+    FOR EACH ROW EXECUTE FUNCTION record_deleted_row('order_id');
+
+-- Tombstones only need to outlive the longest gap between client syncs
+-- (clients fully reload after FULL_RESYNC_AFTER); prune them periodically:
+-- DELETE FROM deleted_rows WHERE deleted_at < now() - interval '30 days';
@@ -0,0 +1,14 @@
+-- ========================
+-- Indexes for the app's access paths
+-- ========================
+-- Grids and the order list page newest-first by keyset on (date, id)
+CREATE INDEX IF NOT EXISTS expenses_date_id ON expenses (date DESC, expense_id DESC);
+CREATE INDEX IF NOT EXISTS income_date_id ON income (date DESC, income_id DESC);
+CREATE INDEX IF NOT EXISTS orders_delivery_date_id ON orders (delivery_date DESC, order_id DESC);
+
+-- income rows are looked up by the order they settled
+CREATE INDEX IF NOT EXISTS income_order_id ON income (order_id);
+
+-- customer filters match on the normalized (lower-case) name
+CREATE INDEX IF NOT EXISTS orders_customer ON orders (lower(customer));
+CREATE INDEX IF NOT EXISTS income_customer ON income (lower(customer));
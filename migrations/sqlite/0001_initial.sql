@@ -0,0 +1,111 @@
+-- SQLite version of DBSchema.txt, for running the app and benchmarks offline.
+-- Dates are stored as ISO 'YYYY-MM-DD' text.
+
+CREATE TABLE IF NOT EXISTS expenses (
+    expense_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    category VARCHAR(100) NOT NULL,
+    amount NUMERIC(12,2) NOT NULL,
+    comment TEXT,
+    updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS income (
+    income_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id INT,
+    date TEXT NOT NULL,
+    customer VARCHAR(100) NOT NULL,
+    amount NUMERIC(12,2) NOT NULL,
+    payment_method VARCHAR(50) NOT NULL,
+    comment TEXT,
+    updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS orders (
+    order_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    delivery_date TEXT NOT NULL,
+    customer VARCHAR(100) NOT NULL,
+    item VARCHAR(100) NOT NULL,
+    price NUMERIC(12,2) NOT NULL,
+    advance NUMERIC(12,2) DEFAULT 0,
+    pending_balance NUMERIC(12,2) NOT NULL,
+    description TEXT,
+    delivered BOOLEAN DEFAULT FALSE,
+    updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS monthly_summary (
+    month TEXT PRIMARY KEY,
+    total_expense NUMERIC(14,2) NOT NULL DEFAULT 0,
+    total_income NUMERIC(14,2) NOT NULL DEFAULT 0
+);
+
+-- monthly_summary upkeep, one trigger per table and operation.
+-- (No INSERT OR IGNORE here: an outer upsert's conflict policy would override it.)
+CREATE TRIGGER IF NOT EXISTS expenses_summary_insert AFTER INSERT ON expenses BEGIN
+    INSERT INTO monthly_summary (month) SELECT strftime('%Y-%m-01', NEW.date) WHERE NOT EXISTS (SELECT 1 FROM monthly_summary WHERE month = strftime('%Y-%m-01', NEW.date));
+    UPDATE monthly_summary SET total_expense = total_expense + NEW.amount WHERE month = strftime('%Y-%m-01', NEW.date);
+END;
+
+CREATE TRIGGER IF NOT EXISTS expenses_summary_update AFTER UPDATE OF date, amount ON expenses BEGIN
+    UPDATE monthly_summary SET total_expense = total_expense - OLD.amount WHERE month = strftime('%Y-%m-01', OLD.date);
+    INSERT INTO monthly_summary (month) SELECT strftime('%Y-%m-01', NEW.date) WHERE NOT EXISTS (SELECT 1 FROM monthly_summary WHERE month = strftime('%Y-%m-01', NEW.date));
+    UPDATE monthly_summary SET total_expense = total_expense + NEW.amount WHERE month = strftime('%Y-%m-01', NEW.date);
+END;
+
+CREATE TRIGGER IF NOT EXISTS expenses_summary_delete AFTER DELETE ON expenses BEGIN
+    UPDATE monthly_summary SET total_expense = total_expense - OLD.amount WHERE month = strftime('%Y-%m-01', OLD.date);
+END;
+
+CREATE TRIGGER IF NOT EXISTS income_summary_insert AFTER INSERT ON income BEGIN
+    INSERT INTO monthly_summary (month) SELECT strftime('%Y-%m-01', NEW.date) WHERE NOT EXISTS (SELECT 1 FROM monthly_summary WHERE month = strftime('%Y-%m-01', NEW.date));
+    UPDATE monthly_summary SET total_income = total_income + NEW.amount WHERE month = strftime('%Y-%m-01', NEW.date);
+END;
+
+CREATE TRIGGER IF NOT EXISTS income_summary_update AFTER UPDATE OF date, amount ON income BEGIN
+    UPDATE monthly_summary SET total_income = total_income - OLD.amount WHERE month = strftime('%Y-%m-01', OLD.date);
+    INSERT INTO monthly_summary (month) SELECT strftime('%Y-%m-01', NEW.date) WHERE NOT EXISTS (SELECT 1 FROM monthly_summary WHERE month = strftime('%Y-%m-01', NEW.date));
+    UPDATE monthly_summary SET total_income = total_income + NEW.amount WHERE month = strftime('%Y-%m-01', NEW.date);
+END;
+
+CREATE TRIGGER IF NOT EXISTS income_summary_delete AFTER DELETE ON income BEGIN
+    UPDATE monthly_summary SET total_income = total_income - OLD.amount WHERE month = strftime('%Y-%m-01', OLD.date);
+END;
+
+-- change tracking for delta sync: updated_at on every write, tombstones for deletes
+CREATE TABLE IF NOT EXISTS deleted_rows (
+    table_name VARCHAR(50) NOT NULL,
+    row_id INT NOT NULL,
+    deleted_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+CREATE INDEX IF NOT EXISTS deleted_rows_table_deleted_at ON deleted_rows (table_name, deleted_at);
+CREATE INDEX IF NOT EXISTS expenses_updated_at ON expenses (updated_at, expense_id);
+CREATE INDEX IF NOT EXISTS income_updated_at ON income (updated_at, income_id);
+CREATE INDEX IF NOT EXISTS orders_updated_at ON orders (updated_at, order_id);
+
+CREATE TRIGGER IF NOT EXISTS expenses_touch_updated_at AFTER UPDATE ON expenses
+WHEN NEW.updated_at IS OLD.updated_at BEGIN
+    UPDATE expenses SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE expense_id = NEW.expense_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS expenses_record_deleted AFTER DELETE ON expenses BEGIN
+    INSERT INTO deleted_rows (table_name, row_id) VALUES ('expenses', OLD.expense_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS income_touch_updated_at AFTER UPDATE ON income
+WHEN NEW.updated_at IS OLD.updated_at BEGIN
+    UPDATE income SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE income_id = NEW.income_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS income_record_deleted AFTER DELETE ON income BEGIN
+    INSERT INTO deleted_rows (table_name, row_id) VALUES ('income', OLD.income_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS orders_touch_updated_at AFTER UPDATE ON orders
+WHEN NEW.updated_at IS OLD.updated_at BEGIN
+    UPDATE orders SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE order_id = NEW.order_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS orders_record_deleted AFTER DELETE ON orders BEGIN
+    INSERT INTO deleted_rows (table_name, row_id) VALUES ('orders', OLD.order_id);
+END;
@@ -0,0 +1,8 @@
+-- ========================
+-- Drop indexes no query uses
+-- ========================
+-- Customer search and the settled-order lookup run over the in-memory synced
+-- frames, never as SQL filters, so these only cost time on every write.
+DROP INDEX IF EXISTS income_order_id;
+DROP INDEX IF EXISTS orders_customer;
+DROP INDEX IF EXISTS income_customer;
@@ -0,0 +1,59 @@
+import streamlit as st
+import pandas as pd
+from supabasedbutil import get_customer_ledger
+from utils.dates import to_display
+from utils.formatters import format_money
+
+def customers_page():
+    st.title("Customers")
+
+    ledger = get_customer_ledger()
+    if not len(ledger):
+        st.info("No customers yet.")
+        return
+
+    table = ledger.table
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Customers", len(ledger))
+    c2.metric("Outstanding", f"₹{format_money(table['outstanding'].sum())}")
+    c3.metric("Owing customers", int((table["outstanding"] > 0).sum()))
+
+    st.dataframe(pd.DataFrame({
+        "Customer": table["name"],
+        "Open Orders": table["open_orders"],
+        "Outstanding": table["outstanding"] / 100,
+        "Advance Held": table["advance_held"] / 100,
+        "Lifetime Revenue": table["lifetime_revenue"] / 100,
+        "Last Order": to_display(table["last_order_date"]),
+        "Last Payment": to_display(table["last_payment_date"]),
+    }).reset_index(drop=True), width='stretch', hide_index=True)
+
+    name = st.selectbox("Customer", [None] + sorted(table["name"], key=str.casefold), key="customer_ledger_name",
+                        format_func=lambda n: "Choose a customer" if n is None else n)
+    if name is None:
+        return
+
+    balance = ledger.get(name)
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Outstanding", f"₹{format_money(balance.outstanding)}")
+    c2.metric("Lifetime Revenue", f"₹{format_money(balance.lifetime_revenue)}")
+    c3.metric("Last Order", to_display(pd.Series([balance.last_order_date])).iloc[0] or "—")
+
+    orders = ledger.orders_of(name)
+    st.subheader(f"Open Orders ({len(orders)})")
+    if len(orders):
+        st.dataframe(pd.DataFrame({
+            "Order #": orders["order_id"],
+            "Delivery": to_display(orders["delivery_date"]),
+            "Advance": orders["advance"] / 100,
+            "Pending": orders["pending_balance"] / 100,
+        }), width='stretch', hide_index=True)
+
+    payments = ledger.payments_of(name)
+    st.subheader(f"Payments ({len(payments)})")
+    if len(payments):
+        st.dataframe(pd.DataFrame({
+            "Date": to_display(payments["date"]),
+            "Order #": payments["order_id"],
+            "Amount": payments["amount"] / 100,
+        }), width='stretch', hide_index=True)
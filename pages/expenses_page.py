@@ -1,7 +1,9 @@
 import streamlit as st
 from datetime import date
-from supabasedbutil import add_expense, get_expenses, save_expenses
-from utils.aggrid_utils import editable_grid
+from supabasedbutil import add_expense, get_expenses, save_expenses, delete_expenses, encode_frame, count_rows, sealed_date
+from utils.aggrid_utils import GRID_PAGE_SIZE, editable_grid, grid_page
+from utils.bulk_io import import_export_panel
+from utils.validation import ValidationError
 from st_aggrid import GridOptionsBuilder
 
 def expenses_page():
@@ -11,30 +13,32 @@ def expenses_page():
         e_date = st.date_input("Date", date.today())
         e_category = st.text_input("Category")
         #e_amount_str = st.text_input("Amount")
-        e_amount_str = st.number_input("Amount", min_value=0)
+        e_amount = st.number_input("Amount", min_value=0)
         e_comment = st.text_area("Comment")
         if st.form_submit_button("Add Expense"):
             try:
-                e_amount = float(e_amount_str)
                 add_expense(str(e_date), e_category, e_amount, e_comment)
                 st.success("Expense added successfully!")
-            except ValueError:
-                st.error("Please enter a valid number for amount.")
+            except ValidationError as e:
+                st.error(f"Expense not added: {e}")
+
+    import_export_panel(["expenses"], key="expenses_io")
 
     st.subheader("Edit Expenses")
     selected_cols = ["expense_id", "date", "category", "amount","comment"]
-    df_exp = get_expenses()
+    offset = grid_page("expenses", count_rows("expenses"))
+    df_exp = get_expenses(limit=GRID_PAGE_SIZE, offset=offset)
     if not df_exp.empty:
-        filtered_df = df_exp[selected_cols]
+        filtered_df = encode_frame("expenses", df_exp)[selected_cols]
         gb=get_grid_options_builder(filtered_df)
-        editable_grid(filtered_df, save_expenses, gb, grid_key="expenses")
+        editable_grid(filtered_df, save_expenses, gb, "expense_id", delete_func=delete_expenses, grid_key="expenses", table="expenses",
+                      sealed_through=sealed_date("expenses"))
     else:
         st.info("No Expense records found yet.")
 
 
 def get_grid_options_builder(df):
     gb = GridOptionsBuilder.from_dataframe(df)
-    gb.configure_pagination(paginationAutoPageSize=False, paginationPageSize=50)
     gb.configure_default_column(editable=True)
     gb.configure_column("id", hide=True)
     gb.configure_column("expense_id", editable=False)  # Make 'expense_id' read-only
@@ -1,26 +1,30 @@
 import streamlit as st
 from datetime import date
-from supabasedbutil import add_income, get_income, save_income
-from utils.aggrid_utils import editable_grid
+from supabasedbutil import add_income, get_income, save_income, encode_frame, count_rows, sealed_date
+from utils.aggrid_utils import GRID_PAGE_SIZE, editable_grid, grid_page
+from utils.bulk_io import import_export_panel
 from st_aggrid import GridOptionsBuilder
 
 def income_page():
     st.title("Completed Orders")
 
-    df = get_income()
-    selected_cols = ["order_id", "date", "customer", "amount","payment_method","comment"]
+    import_export_panel(["income", "orders"], key="income_io")
+
+    offset = grid_page("income", count_rows("income"))
+    df = get_income(limit=GRID_PAGE_SIZE, offset=offset)
+    selected_cols = ["income_id", "order_id", "date", "customer", "amount","payment_method","comment"]
     if not df.empty:
-        filtered_df = df[selected_cols]
+        filtered_df = encode_frame("income", df)[selected_cols]
         gb=get_grid_options_builder(filtered_df)
-        editable_grid(filtered_df, save_income, gb, grid_key="income" )
+        editable_grid(filtered_df, save_income, gb, "income_id", grid_key="income", table="income",
+                      sealed_through=sealed_date("income"))
     else:
         st.info("No income records found yet.")
 
 def get_grid_options_builder(df):
     gb = GridOptionsBuilder.from_dataframe(df)
-    gb.configure_pagination(paginationAutoPageSize=False, paginationPageSize=50)
     gb.configure_default_column(editable=True)
-    gb.configure_column("id", hide=True)
+    gb.configure_column("income_id", hide=True)
     gb.configure_column("order_id", editable=False)  # Make 'order_id' read-only
     gb.configure_selection("multiple", use_checkbox=False)
     gb.configure_grid_options(suppressRowClickSelection=True)
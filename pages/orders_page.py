@@ -1,8 +1,11 @@
 import streamlit as st
 from datetime import datetime, date
 import pandas as pd
-from utils.formatters import parse_date_str
-from supabasedbutil import add_order, get_orders, mark_order_delivered, move_order_to_income, update_order, cancel_order
+from utils.formatters import parse_date_str, format_money
+from utils.order_index import OrderIndex
+from utils.validation import ValidationError
+from utils.write_queue import InFlightError
+from supabasedbutil import cached_read, add_order, get_orders, mark_order_delivered, move_order_to_income, settle_orders, update_order, cancel_order
 
 
 # helper: safe iso string
@@ -12,27 +15,48 @@ def to_iso_string(val):
     return str(val)
 
 
-# helper: format a value for display as DD-MM-YYYY without changing stored value/type
-def format_date_for_display(val):
-    if pd.isna(val):
-        return ""
-    # If it's a pandas Timestamp or datetime
-    if isinstance(val, (pd.Timestamp, datetime)):
-        try:
-            return pd.to_datetime(val).strftime('%d-%m-%Y')
-        except Exception:
-            return str(val)
-    # If it's a date object
-    if isinstance(val, date):
+ORDERS_PER_PAGE = 20
+
+
+def get_order_index():
+    return cached_read("order_index", ["orders", "pending:orders"], lambda: OrderIndex(get_orders()), copy=False)
+
+
+def order_list(index, positions, key, empty_message):
+    """One button per order, for the current page of positions only."""
+    if len(positions) == 0:
+        st.write(empty_message)
+        return
+    pages = (len(positions) - 1) // ORDERS_PER_PAGE + 1
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages}, {len(positions)} orders)", min_value=1, max_value=pages, value=1, key=f"{key}_page_{pages}")
+    visible = positions[(page - 1) * ORDERS_PER_PAGE:page * ORDERS_PER_PAGE]
+    for _, row in index.df.iloc[visible].iterrows():
+        number = f"#{row['order_id']}" if row["order_id"] > 0 else "saving…"
+        order_label = f"**{row['delivery_display']}** – {row['customer']} – {row['item']} - {number}"
+        if st.button(order_label, key=f"{key}_{row['order_id']}"):
+            st.session_state["selected_order"] = row
+
+
+def settle_form(index, positions):
+    """Mark several payment-pending orders paid in one call."""
+    pending = index.df.iloc[positions]
+    # orders still in the write-behind queue can't be settled yet
+    pending = pending[pending["order_id"] > 0]
+    labels = dict(zip(pending["order_id"], pending["delivery_display"] + " – " + pending["customer"].astype(str) + " – #" + pending["order_id"].astype(str)))
+    to_settle = st.multiselect("Mark paid", list(labels), format_func=labels.get, key="settle_ids")
+    if st.button("Mark selected paid", disabled=not to_settle):
         try:
-            return val.strftime('%d-%m-%Y')
-        except Exception:
-            return str(val)
-    # Fallback: try to parse
-    try:
-        return pd.to_datetime(val).strftime('%d-%m-%Y')
-    except Exception:
-        return str(val)
+            count = settle_orders(to_settle)
+        except ValidationError as e:
+            # income is dated by delivery, and sealed periods are read-only
+            st.warning(f"Nothing settled: orders {', '.join(f'#{i}' for i in e.problems['row'])} were delivered "
+                       f"in an archived period. Edit their delivery date first.")
+            return
+        st.success(f"{count} order(s) moved to income!")
+        del st.session_state["settle_ids"]
+        st.rerun()
 
 
 def orders_page():
@@ -40,70 +64,63 @@ def orders_page():
     if "editing_order" not in st.session_state:
         st.session_state["editing_order"] = None
 
-    df_orders = get_orders()
+    index = get_order_index()
 
-    if df_orders.empty:
+    if len(index) == 0:
         st.info("No orders found.")
     else:
 
-        # Ensure delivery_date column exists and convert it to python date objects for consistent comparisons
-        if "delivery_date" in df_orders.columns:
-            # Convert to datetime then to date (python.date) to match streamlit date_input outputs
-            df_orders['delivery_date'] = pd.to_datetime(df_orders['delivery_date'], errors='coerce').dt.date
-        else:
-            # Keep behavior unchanged; just avoid crashing later
-            st.error("delivery_date column not found in orders data.")
-
-        # Now it's safe to sort by delivery_date (they are date objects or NaT/NaN converted to NaT->NaN)
-        # For rows where conversion failed, pandas will have NaN; sort_values will put them at the end.
-        df_orders = df_orders.sort_values(by="delivery_date", ascending=True)
+        f1, f2 = st.columns([3, 2])
+        query = f1.text_input("Search orders", key="order_search", placeholder="Customer, item or order #")
+        date_range = f2.date_input("Delivery between", value=(), key="order_dates")
+        start = date_range[0] if len(date_range) > 0 else None
+        end = date_range[1] if len(date_range) > 1 else None
+        positions = index.search(query, start, end)
 
-        # Use python.date for today so comparisons with df (which are python.date) are consistent
-        today = date.today()
-        payment_pending = df_orders[df_orders['delivery_date'] < today]
-        open_orders = df_orders[df_orders['delivery_date'] >= today]
+        # rows are sorted by delivery date, so today splits them into pending and open
+        split = index.date_position(date.today())
+        payment_pending = positions[positions < split]
+        open_orders = positions[positions >= split]
 
         st.subheader("Open Orders")
-        if open_orders.empty:
-            st.write("No open orders.")
-        else:
-            for _, row in open_orders.iterrows():
-                d = format_date_for_display(row['delivery_date'])  # DD-MM-YYYY for display
-                order_label = f"**{d}** – {row['customer']} – {row['item']} - #{row['order_id']}"
-                if st.button(order_label, key=f"open_{row['order_id']}"):
-                    st.session_state["selected_order"] = row
+        order_list(index, open_orders, "open", "No open orders.")
 
         st.subheader("Payment Pending")
-        if payment_pending.empty:
-            st.write("No payment pending orders.")
-        else:
-            for _, row in payment_pending.iterrows():
-                d = format_date_for_display(row['delivery_date'])
-                order_label = f"**{d}** – {row['customer']} – {row['item']} - #{row['order_id']}"
-                if st.button(order_label, key=f"pending_{row['order_id']}"):
-                    st.session_state["selected_order"] = row
+        order_list(index, payment_pending, "pending", "No payment pending orders.")
+        if len(payment_pending):
+            settle_form(index, payment_pending)
 
         if "selected_order" in st.session_state:
             row = st.session_state["selected_order"]
             st.subheader(f"Details for Order #{row['order_id']}")
-            st.write(f"**Delivery Date:** {format_date_for_display(row['delivery_date'])}")
+            st.write(f"**Delivery Date:** {row.get('delivery_display', row['delivery_date'])}")
             st.write(f"**Customer:** {row['customer']}")
             st.write(f"**Item:** {row['item']}")
-            st.write(f"**Price:** ₹{row['price']} | **Advance:** ₹{row['advance']} | **Pending:** ₹{row['pending_balance']}")
+            st.write(f"**Price:** ₹{format_money(row['price'])} | **Advance:** ₹{format_money(row['advance'])} | **Pending:** ₹{format_money(row['pending_balance'])}")
             st.write(f"**Description:** {row['description']}")
 
+            # a negative id is an order still waiting in the write-behind queue
+            saving = row["order_id"] < 0
+            if saving:
+                st.caption("Saving… this order can be paid or edited once it reaches the database.")
             c1, c2, c3, c4 = st.columns(4)
-            if c1.button("Paid"):
-                move_order_to_income(row["order_id"])
-                st.success("Order moved to income!")
-                st.rerun()
-            if c2.button("Edit"):
+            if c1.button("Paid", disabled=saving):
+                try:
+                    move_order_to_income(row["order_id"])
+                    st.success("Order moved to income!")
+                    st.rerun()
+                except ValidationError:
+                    st.warning("Order not moved: it was delivered in an archived period. Edit its delivery date first.")
+            if c2.button("Edit", disabled=saving):
                 st.session_state["editing_order"] = row
                 st.rerun()
             if c3.button("Cancel"):
-                cancel_order(row["order_id"])
-                st.success("Order cancelled!")
-                st.rerun()
+                try:
+                    cancel_order(row["order_id"])
+                    st.success("Order cancelled!")
+                    st.rerun()
+                except InFlightError as e:
+                    st.warning(f"Order not cancelled: {e}")
             # if row.get("delivered", False):
                 # c1.button("Delivered", disabled=True)
             # else:
@@ -128,15 +145,13 @@ def orders_page():
                     e_date = st.date_input("Delivery Date", default_date)
                     e_customer = st.text_input("Customer", row['customer'])
                     e_item = st.text_input("Item", row['item'])
-                    e_price_str = st.text_input("Price", str(row['price']))
-                    e_advance_str = st.text_input("Advance", str(row['advance']))
+                    e_price = st.number_input("Price", value=float(row['price']) / 100, format="%.2f")
+                    e_advance = st.number_input("Advance", value=float(row['advance'] if pd.notna(row['advance']) else 0) / 100, format="%.2f")
                     e_desc = st.text_area("Description", row['description'])
                     col1, col2 = st.columns([1,1])
                     with col1:
                         if st.form_submit_button("Update Order"):
                             try:
-                                e_price = float(e_price_str)
-                                e_advance = float(e_advance_str)
                                 # e_date from st.date_input is a python.date, so pass str(e_date) which yields ISO 'YYYY-MM-DD'
                                 update_order(
                                     row["order_id"],
@@ -150,8 +165,8 @@ def orders_page():
                                 st.success("Order updated successfully!")
                                 st.session_state["editing_order"] = None
                                 st.rerun()
-                            except ValueError:
-                                st.error("Please enter valid numbers for price and advance.")
+                            except ValidationError as e:
+                                st.error(f"Order not updated: {e}")
                     with col2:
                         if st.form_submit_button("Cancel"):
                             st.session_state["editing_order"] = None
@@ -163,14 +178,12 @@ def orders_page():
         o_date = st.date_input("Delivery Date", date.today(), key="o_date")
         o_customer = st.text_input("Customer", key="o_customer")
         o_item = st.text_input("Item", key="o_item")
-        o_price_str = st.number_input("Price", min_value=0, key="o_price")
-        o_advance_str = st.number_input("Advance", min_value=0, key="o_advance")
+        o_price = st.number_input("Price", min_value=0, key="o_price")
+        o_advance = st.number_input("Advance", min_value=0, key="o_advance")
         o_desc = st.text_area("Detail Description", key="o_desc")
 
         if st.form_submit_button("Add Order"):
             try:
-                o_price = float(o_price_str)
-                o_advance = float(o_advance_str)
                 # o_date is a python.date; str(o_date) yields ISO string 'YYYY-MM-DD' — do not change this type
                 add_order(
                     o_date.isoformat(),
@@ -185,5 +198,5 @@ def orders_page():
                     if key in st.session_state:
                         del st.session_state[key]
                 st.rerun()
-            except ValueError:
-                st.error("Please enter valid numbers for price and advance.")
+            except ValidationError as e:
+                st.error(f"Order not added: {e}")
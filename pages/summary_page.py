@@ -1,31 +1,57 @@
 import streamlit as st
 import pandas as pd
-from supabasedbutil import get_expenses, get_income
+from supabasedbutil import get_monthly_summary, get_analytics_cube
+from utils.analytics import DIMENSIONS, MEASURES
 from utils.formatters import parse_date_str
+from utils.dates import parse_dates
 
 def summary_page():
     st.title("Monthly Summary")
 
-    df_exp = get_expenses()
-    df_inc = get_income()
+    df_sum = get_monthly_summary()
 
-    if not df_exp.empty:
-        df_exp["date"] = pd.to_datetime(df_exp["date"], format="%Y-%m-%d")
-        df_exp["Month"] = df_exp["date"].dt.to_period("M")
-        exp_summary = df_exp.groupby("Month")["amount"].sum().reset_index()
-        exp_summary.rename(columns={"amount": "Total Expense"}, inplace=True)
-    else:
-        exp_summary = pd.DataFrame(columns=["Month", "Total Expense"])
+    # totals are integer paise: subtract exactly, convert to rupees for display
+    summary = pd.DataFrame({
+        "Month": parse_dates(df_sum["month"]).dt.to_period("M"),
+        "Total Expense": df_sum["total_expense"] / 100,
+        "Total Income": df_sum["total_income"] / 100,
+        "Net Savings": (df_sum["total_income"] - df_sum["total_expense"]) / 100,
+    })
 
-    if not df_inc.empty:
-        df_inc["date"] = pd.to_datetime(df_inc["date"], format="%Y-%m-%d")
-        df_inc["Month"] = df_inc["date"].dt.to_period("M")
-        inc_summary = df_inc.groupby("Month")["amount"].sum().reset_index()
-        inc_summary.rename(columns={"amount": "Total Income"}, inplace=True)
-    else:
-        inc_summary = pd.DataFrame(columns=["Month", "Total Income"])
+    st.dataframe(summary, width='stretch')
 
-    summary = pd.merge(exp_summary, inc_summary, on="Month", how="outer").fillna(0)
-    summary["Net Savings"] = summary["Total Income"] - summary["Total Expense"]
+    cube = get_analytics_cube()
+    if not cube.months:
+        return
 
-    st.dataframe(summary, width='stretch')
+    breakdown_tab, yoy_tab, rolling_tab = st.tabs(["Breakdown", "Year over year", "Rolling average"])
+
+    with breakdown_tab:
+        col1, col2 = st.columns(2)
+        dimension = col1.selectbox("Break down by", list(DIMENSIONS), key="summary_dimension")
+        month = col2.selectbox("Month", [None] + cube.months[::-1], key="summary_month",
+                               format_func=lambda m: "All months" if m is None else str(m))
+        parts = cube.breakdown(dimension, month)
+        parts = pd.DataFrame({"Amount": parts["amount"] / 100, "Entries": parts["count"]})
+        st.bar_chart(parts["Amount"])
+        st.dataframe(parts, width='stretch')
+
+        member = st.selectbox("Drill into", [None] + cube.members(dimension), key="summary_member",
+                              format_func=lambda m: "—" if m is None else m)
+        if member is not None:
+            trend = cube.trend(dimension, member) / 100
+            st.line_chart(trend.set_axis(trend.index.to_timestamp()).rename(member))
+
+    with yoy_tab:
+        measure = st.radio("Measure", MEASURES, horizontal=True, key="summary_yoy_measure",
+                           format_func=str.capitalize)
+        table, change = cube.year_over_year(measure)
+        st.dataframe(table / 100, width='stretch')
+        if len(table.columns) > 1:
+            st.caption("Change against the same month of the previous year (%)")
+            st.dataframe(change.iloc[:, 1:].round(1), width='stretch')
+
+    with rolling_tab:
+        window = st.slider("Window (months)", 2, 12, 3, key="summary_window")
+        averages = cube.rolling(window) / 100
+        st.line_chart(averages.set_axis(averages.index.to_timestamp()))
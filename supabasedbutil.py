@@ -1,54 +1,520 @@
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 import pandas as pd
-from supabase import create_client
 from datetime import datetime
-from utils.formatters import format_date_str
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from archive import ARCHIVE_TABLES, month_stats, read_manifest, read_table, sealed_through, write_period
+from backends import LazyBackend
+from utils.dates import parse_dates, to_db
+from utils.analytics import AnalyticsCube
+from utils.customer_ledger import CustomerLedger
+from utils.write_queue import WriteQueue
+from utils.search_index import TableSearchIndex
+from utils.table_schema import TABLE_SCHEMAS, columns_of_kind
+from utils.validation import ValidationError, require_valid
+from utils.instrumentation import InstrumentedBackend, instrument_module
+
+# --- Database Connection ---
+# Supabase REST by default; see backends/__init__.py for the DB_BACKEND setting.
+# The client is created on the first query, not at import.
+backend = InstrumentedBackend(LazyBackend())
+
+# --- Read Cache ---
+# Shared by every session in this process. Each mutating helper bumps the
+# version of the table it touched, so cached reads stay valid until the data
+# actually changes (or the TTL runs out, to pick up writes from elsewhere).
+CACHE_TTL_SECONDS = float(os.environ.get("CACHE_TTL_SECONDS", 300))
+
+@st.cache_resource
+def get_read_cache():
+    return {
+        "lock": threading.Lock(),
+        "versions": {},
+        "entries": {},
+        "hits": 0,
+        "misses": 0,
+    }
+
+def table_version(table):
+    cache = get_read_cache()
+    with cache["lock"]:
+        return cache["versions"].get(table, 0)
+
+def bump_table_version(table):
+    cache = get_read_cache()
+    with cache["lock"]:
+        cache["versions"][table] = cache["versions"].get(table, 0) + 1
+
+def cached_read(key, tables, loader, copy=True):
+    """Return loader() from the cache while the given tables are unchanged.
+
+    Values are copied on the way out so callers can mutate them; pass
+    copy=False for read-only values such as indexes.
+    """
+    cache = get_read_cache()
+    with cache["lock"]:
+        stamp = tuple(cache["versions"].get(t, 0) for t in tables)
+        entry = cache["entries"].get(key)
+        if entry and entry["stamp"] == stamp and time.monotonic() - entry["at"] < CACHE_TTL_SECONDS:
+            cache["hits"] += 1
+            return entry["value"].copy() if copy else entry["value"]
+        cache["misses"] += 1
+
+    value = loader()
+    with cache["lock"]:
+        cache["entries"][key] = {"stamp": stamp, "at": time.monotonic(), "value": value}
+    return value.copy() if copy else value
+
+def clear_read_cache():
+    cache = get_read_cache()
+    with cache["lock"]:
+        cache["entries"].clear()
+
+def cache_stats():
+    cache = get_read_cache()
+    with cache["lock"]:
+        return {
+            "hits": cache["hits"],
+            "misses": cache["misses"],
+            "entries": len(cache["entries"]),
+            "versions": dict(cache["versions"]),
+            "ttl_seconds": CACHE_TTL_SECONDS,
+        }
+
+# --- Typed Frames ---
+# Fetched rows are decoded into compact, typed frames (see utils/table_schema.py):
+# int32 ids, categorical labels, datetime64 dates and money as int64 paise,
+# so sums are exact. encode_frame turns them back into plain values for writes
+# and display (rupees, ISO date strings).
+def decode_frame(table, df):
+    df = df.copy()
+    for name, column in TABLE_SCHEMAS[table].items():
+        if name not in df.columns:
+            continue
+        values = df[name]
+        if column.kind == "id":
+            df[name] = pd.to_numeric(values).astype("Int32" if values.isna().any() else "int32")
+        elif column.kind == "money":
+            paise = (pd.to_numeric(values) * 100).round()
+            df[name] = paise.astype("Int64" if paise.isna().any() else "int64")
+        elif column.kind == "date":
+            df[name] = parse_dates(values)
+        elif column.kind == "timestamp":
+            df[name] = pd.to_datetime(values, format="ISO8601", utc=True)
+        elif column.kind == "category":
+            df[name] = values.astype("category")
+        elif column.kind == "text":
+            df[name] = values.astype("string")
+        elif column.kind == "bool":
+            df[name] = values.fillna(False).astype(bool)
+    return df
+
+def decode_rows(table, df):
+    """decode_frame over all of the table's columns, so an empty result is typed rather than shapeless."""
+    missing = [name for name in TABLE_SCHEMAS[table] if name not in df.columns]
+    return decode_frame(table, df.reindex(columns=[*df.columns, *missing]))
+
+def encode_frame(table, df):
+    """Typed frame -> plain values: rupees for money, ISO strings for dates, str for categories."""
+    df = df.copy()
+    for name, column in TABLE_SCHEMAS[table].items():
+        if name not in df.columns:
+            continue
+        if column.kind == "money":
+            df[name] = df[name].astype("Float64") / 100
+        elif column.kind == "date":
+            df[name] = to_db(df[name])
+        elif column.kind == "category":
+            df[name] = df[name].astype(object)
+    return df
+
+def recategorize(table, df):
+    # concatenating categoricals with different categories falls back to object
+    for name in columns_of_kind(table, "category"):
+        if name in df.columns and df[name].dtype != "category":
+            df[name] = df[name].astype("category")
+    return df
+
+# --- Delta Sync ---
+# Each table is kept as a local DataFrame; a refresh fetches only rows whose
+# updated_at moved past the last watermark, plus tombstones for deleted rows.
+# Changes in the last SYNC_OVERLAP are re-read on every refresh, to catch
+# transactions that committed after a later timestamp was already seen.
+SYNC_OVERLAP = pd.Timedelta(minutes=5)
+# tombstones are pruned eventually, so a copy this stale is reloaded in full
+FULL_RESYNC_AFTER = 24 * 3600
 
-# --- Supabase Connection ---
 @st.cache_resource
-def get_supabase_client():
-    url = st.secrets["SUPABASE_URL"]
-    key = st.secrets["SUPABASE_SERVICE_ROLE_KEY"]  # use Service Role for full CRUD
-    return create_client(url, key)
+def get_sync_state():
+    return {"lock": threading.Lock(), "locks": {}, "tables": {}}
+
+def synced_table(table):
+    """Full local copy of a table (newest first), brought up to date with a delta fetch."""
+    state = get_sync_state()
+    with state["lock"]:
+        table_lock = state["locks"].setdefault(table, threading.Lock())
+    with table_lock:
+        version = table_version(table)
+        entry = state["tables"].get(table)
+        if entry is None or time.monotonic() - entry["loaded_at"] > FULL_RESYNC_AFTER:
+            df = _load_full(table)
+            entry = {"df": df, "watermark": _max_timestamp(df, "updated_at"), "loaded_at": time.monotonic()}
+        elif entry["version"] == version and time.monotonic() - entry["synced_at"] < CACHE_TTL_SECONDS:
+            # already synced since the last local write, e.g. by load_tables
+            return entry["df"]
+        else:
+            entry = _apply_changes(table, entry)
+        state["tables"][table] = {**entry, "version": version, "synced_at": time.monotonic()}
+        return entry["df"]
+
+def _load_full(table):
+    through = sealed_through() if table in ARCHIVE_TABLES else None
+    if through is None:
+        return decode_rows(table, fetch_table(table))
+    # sealed months come from the local archive; only the open period is fetched
+    start = (pd.Timestamp(through) + pd.Timedelta(days=1)).date().isoformat()
+    live = decode_rows(table, fetch_table(table, start=start))
+    archived = archived_table(table)
+    if archived.empty:
+        return live
+    df = pd.concat([live, archived], ignore_index=True) if not live.empty else archived
+    date_col, id_col = TABLE_KEYS[table]
+    return recategorize(table, df).sort_values([date_col, id_col], ascending=False, ignore_index=True)
+
+def reset_sync_state():
+    """Forget the local copies; the next read of each table is a full load."""
+    state = get_sync_state()
+    with state["lock"]:
+        state["tables"].clear()
+
+def _max_timestamp(df, column):
+    if df.empty or column not in df.columns:
+        return None
+    return pd.to_datetime(df[column], format="ISO8601", utc=True).max()
+
+def _apply_changes(table, entry):
+    date_col, id_col = TABLE_KEYS[table]
+    since = entry["watermark"] - SYNC_OVERLAP if entry["watermark"] is not None else None
+    chunks = list(iter_changes(table, since))
+    changed = decode_rows(table, pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame())
+    deleted = pd.DataFrame(backend.select_deleted(table, since), columns=["row_id", "deleted_at"])
+    if changed.empty and deleted.empty:
+        return entry
+
+    df = entry["df"]
+    if not df.empty:
+        stale = set(deleted["row_id"]) | set(changed[id_col] if not changed.empty else [])
+        df = df[~df[id_col].isin(stale)]
+    df = pd.concat([df, changed], ignore_index=True) if not df.empty else changed
+    if not df.empty:
+        df = recategorize(table, df).sort_values([date_col, id_col], ascending=False, ignore_index=True)
+
+    stamps = [t for t in (entry["watermark"], _max_timestamp(changed, "updated_at"), _max_timestamp(deleted, "deleted_at")) if t is not None]
+    return {**entry, "df": df, "watermark": max(stamps) if stamps else None}
+
+# --- Archive ---
+# Closed periods of expenses and income live in a local Parquet archive (see
+# archive/__init__.py); synced_table reads them from there and fetches only
+# rows dated after the sealed-through date. Sealed rows are read-only: writes
+# dated in a sealed period, and edits or deletes of archived rows, are
+# rejected, since the archive would hide them.
+def archived_table(table):
+    """Sealed rows of a table, read (memory-mapped) once per seal."""
+    return cached_read(("archive", table), [f"archive:{table}"], lambda: read_table(table), copy=False)
+
+def sealed_date(table):
+    """ISO date a table is sealed through, or None when none of it is archived."""
+    return sealed_through() if table in ARCHIVE_TABLES else None
+
+def reject_sealed_rows(table, ids):
+    """Raise ValidationError if any of the row ids is archived."""
+    archived = archived_table(table)
+    if archived.empty:
+        return
+    id_col = TABLE_KEYS[table][1]
+    ids = pd.Series([int(i) for i in ids], dtype="int64")
+    sealed = ids[ids.isin(archived[id_col])]
+    if len(sealed):
+        raise ValidationError(pd.DataFrame({"row": sealed.to_numpy(), "column": id_col,
+                                            "message": f"is in a sealed period (through {sealed_date(table)})"}))
+
+def reject_sealed_settles(order_ids):
+    """Raise ValidationError if settling any of the orders would date an income row in a sealed period."""
+    through = sealed_date("income")
+    if through is None:
+        return
+    orders = synced_table("orders")
+    orders = orders[orders["order_id"].isin(order_ids)]
+    sealed = orders[(orders["delivery_date"] <= pd.Timestamp(through)).to_numpy()]
+    if len(sealed):
+        raise ValidationError(pd.DataFrame({"row": sealed["order_id"].to_numpy(), "column": "delivery_date",
+                                            "message": f"is in a sealed period (through {through})"}))
+
+def seal_period(through):
+    """Archive every expense and income row dated on or before through (ISO date)."""
+    frames = {table: decode_rows(table, fetch_table(table, end=through)) for table in ARCHIVE_TABLES}
+    manifest = write_period(through, frames)
+    for table in ARCHIVE_TABLES:
+        bump_table_version(f"archive:{table}")
+        bump_table_version(table)
+    reset_sync_state()
+    return manifest
+
+def verify_archive():
+    """Months where the database, the manifest and the archived files disagree."""
+    manifest = read_manifest()
+    through = manifest["sealed_through"]
+    if through is None:
+        return []
+    problems = []
+    for table in ARCHIVE_TABLES:
+        expected = manifest["tables"].get(table, {})
+        database = month_stats(table, decode_frame(table, fetch_table(table, end=through)))
+        files = month_stats(table, read_table(table))
+        for month in sorted(set(expected) | set(database) | set(files)):
+            if not expected.get(month) == database.get(month) == files.get(month):
+                problems.append({"table": table, "month": month, "manifest": expected.get(month),
+                                 "database": database.get(month), "files": files.get(month)})
+    return problems
+
+# --- Search ---
+# One inverted index per table over its free-text columns, updated from the
+# synced frames row by row (see utils/search_index.py).
+SEARCH_COLUMNS = {
+    "orders": ["customer", "item", "description"],
+    "income": ["customer", "comment"],
+    "expenses": ["category", "comment"],
+}
+
+@st.cache_resource
+def get_search_indexes():
+    return {table: TableSearchIndex(columns, *TABLE_KEYS[table]) for table, columns in SEARCH_COLUMNS.items()}
+
+def search_records(text, limit=20):
+    """{table: matching rows, newest first} for every word of text as a prefix."""
+    results = {}
+    for table, index in get_search_indexes().items():
+        index.refresh(synced_table(table))
+        results[table] = index.search(text, limit)
+    return results
+
+def row_position(table, row_id):
+    """Position of a row in the table's newest-first listing (as paged by the grids), or None."""
+    df = get_expenses() if table == "expenses" else get_income() if table == "income" else get_orders()
+    matches = (df[TABLE_KEYS[table][1]] == row_id).to_numpy().nonzero()[0]
+    return int(matches[0]) if len(matches) else None
+
+# --- Concurrent Loading ---
+LOAD_WORKERS = 4
+
+@st.cache_resource
+def get_load_executor():
+    return ThreadPoolExecutor(max_workers=LOAD_WORKERS, thread_name_prefix="db-load")
+
+def load_tables(names):
+    """Read several tables at once, in parallel; returns {name: DataFrame} when all are done.
+
+    Pages call this up front so a render waits for its slowest query rather
+    than the sum of them; the get_* calls the page then makes (whole table or
+    one page of it) only slice the synced frames. Those are shared, not
+    copies, so don't modify what this returns.
+    """
+    loaders = {
+        "expenses": lambda: synced_table("expenses"),
+        "income": lambda: synced_table("income"),
+        "orders": lambda: synced_table("orders"),
+        "monthly_summary": get_monthly_summary,
+    }
+    if len(names) == 1:
+        return {names[0]: loaders[names[0]]()}
+
+    script_ctx = get_script_run_ctx()
 
-supabase = get_supabase_client()
+    def load(name):
+        # keep Streamlit's session context (caches) and the rerun's stats in the worker
+        add_script_run_ctx(threading.current_thread(), script_ctx)
+        return loaders[name]()
+
+    executor = get_load_executor()
+    futures = {name: executor.submit(contextvars.copy_context().run, load, name) for name in names}
+    return {name: future.result() for name, future in futures.items()}
 
 # --- Helper Functions ---
+UPSERT_CHUNK_SIZE = 500
+# Keep at or below PostgREST's max-rows setting (1000 by default): a short page
+# is how iter_table_pages knows it reached the end.
+PAGE_SIZE = 1000
+
+# (sort column, id column) each table is paged by, newest first
+TABLE_KEYS = {
+    "expenses": ("date", "expense_id"),
+    "income": ("date", "income_id"),
+    "orders": ("delivery_date", "order_id"),
+}
+
 def format_date(d):
     return datetime.strptime(d, "%Y-%m-%d").strftime("%d-%m-%Y") if d else ""
 
+def to_records(df):
+    """DataFrame -> list of dicts with NaN replaced by None, ready to send as JSON."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+def upsert_rows(table, rows, key_column):
+    # one request per chunk instead of one per row
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        chunk = rows[start:start + UPSERT_CHUNK_SIZE]
+        backend.upsert(table, chunk, key_column)
+
+def iter_table_pages(table, page_size=PAGE_SIZE, start=None, end=None):
+    """Yield a table as DataFrame chunks, newest first, walking pages by keyset on (date, id).
+
+    start/end (ISO dates, inclusive) restrict the rows to a date range.
+    """
+    date_col, id_col = TABLE_KEYS[table]
+    last = None
+    while True:
+        rows = backend.select_page(table, date_col, id_col, page_size, after=last, start=start, end=end)
+        if not rows:
+            return
+        yield pd.DataFrame(rows)
+        if len(rows) < page_size:
+            return
+        last = (rows[-1][date_col], rows[-1][id_col])
+
+def fetch_table(table, limit=None, start=None, end=None):
+    """Collect pages of a table into one DataFrame; stop after `limit` rows if given.
+
+    start/end (ISO dates, inclusive) restrict the rows to a date range.
+    """
+    page_size = min(PAGE_SIZE, limit) if limit else PAGE_SIZE
+    chunks = []
+    fetched = 0
+    for chunk in iter_table_pages(table, page_size, start=start, end=end):
+        chunks.append(chunk)
+        fetched += len(chunk)
+        if limit is not None and fetched >= limit:
+            break
+    if not chunks:
+        return pd.DataFrame()
+    df = pd.concat(chunks, ignore_index=True)
+    return df.head(limit) if limit is not None else df
+
+def iter_changes(table, since=None, page_size=PAGE_SIZE):
+    """Yield rows with updated_at >= since as DataFrame chunks, oldest change first."""
+    _, id_col = TABLE_KEYS[table]
+    last = None
+    while True:
+        rows = backend.select_changes(table, id_col, page_size, since=since, after=last)
+        if not rows:
+            return
+        yield pd.DataFrame(rows)
+        if len(rows) < page_size:
+            return
+        last = (rows[-1]["updated_at"], rows[-1][id_col])
+
+def insert_rows(table, rows):
+    """Bulk insert, one request per UPSERT_CHUNK_SIZE rows."""
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        backend.insert(table, rows[start:start + UPSERT_CHUNK_SIZE])
+    bump_table_version(table)
+
+def delete_rows(table, key_column, ids):
+    ids = [int(i) for i in ids]
+    if ids:
+        backend.delete(table, key_column, ids)
+
+# --- Write-Behind ---
+# New rows from the forms are journaled locally and inserted by a background
+# worker (see utils/write_queue.py). Until then they are shown on top of their
+# table with the negated journal id as their key, and the "pending:<table>"
+# version changes whenever a table's pending rows do.
+WRITE_JOURNAL_PATH = os.environ.get("WRITE_JOURNAL_PATH", "pending_writes.db")
+
+@st.cache_resource
+def get_write_queue():
+    return WriteQueue(WRITE_JOURNAL_PATH, insert_rows, on_change=lambda table: bump_table_version(f"pending:{table}"))
+
+def with_pending(table, df):
+    """df with the table's unflushed rows on top (newest first)."""
+    entries = get_write_queue().pending(table)
+    if not entries:
+        return df
+    id_col = TABLE_KEYS[table][1]
+    rows = decode_frame(table, pd.DataFrame([{**row, id_col: -id_} for id_, row, _ in reversed(entries)]))
+    return recategorize(table, pd.concat([rows, df], ignore_index=True))
+
+def count_rows(table):
+    """Rows in a table, pending ones included."""
+    return cached_read(("count", table), [table, f"pending:{table}"],
+                       lambda: len(with_pending(table, synced_table(table))), copy=False)
+
+def page_of(df, offset=0, limit=None):
+    return df.iloc[offset:None if limit is None else offset + limit].reset_index(drop=True)
+
+def split_pending(ids):
+    """Keys -> (stored ids, journal ids of pending rows)."""
+    ids = [int(i) for i in ids]
+    return [i for i in ids if i > 0], [-i for i in ids if i < 0]
+
+def confirmed_rows(df, key_column):
+    """Rows already in the database; edits to pending rows are dropped."""
+    return df[pd.to_numeric(df[key_column]) > 0]
+
+
+def checked_row(table, row):
+    """row, once it passes validation (see utils/validation.py); raises ValidationError otherwise."""
+    require_valid(table, pd.DataFrame([row]), sealed_date(table))
+    return row
+
 
 # --- Expenses ---
 def add_expense(date, category, amount, comment):
-    supabase.table("expenses").insert({
+    get_write_queue().enqueue("expenses", checked_row("expenses", {
         "date": date,
         "category": category,
         "amount": amount,
         "comment": comment
-    }).execute()
+    }))
 
-def get_expenses():
-    res = supabase.table("expenses").select("*").order("date", desc=True).execute()
-    df = pd.DataFrame(res.data)
-    return df
+def get_expenses(limit=None, offset=0):
+    """Newest-first expenses, pending ones first; pass offset/limit to get one page of rows."""
+    return cached_read(("expenses", offset, limit), ["expenses", "pending:expenses"],
+                       lambda: page_of(with_pending("expenses", synced_table("expenses")), offset, limit))
 
 def save_expenses(df):
+    """Upsert the given (changed) expense rows in bulk; raises ValidationError if any is invalid.
+
+    Returns the number of rows written; rows still in the write-behind queue are skipped.
+    """
     allowed_columns = ["expense_id", "date", "category", "amount", "comment"]
-    df = df[allowed_columns]
-    data = df.to_dict(orient="records")
-    for row in data:
-        expense_id = row["expense_id"]
-        supabase.table("expenses").update(row).eq("expense_id", expense_id).execute()
+    df = confirmed_rows(df[allowed_columns], "expense_id").assign(date=lambda d: to_db(d["date"]))
+    require_valid("expenses", df, sealed_date("expenses"))
+    reject_sealed_rows("expenses", df["expense_id"])
+    upsert_rows("expenses", to_records(df), "expense_id")
+    bump_table_version("expenses")
+    return len(df)
+
+def delete_expenses(expense_ids):
+    stored, pending = split_pending(expense_ids)
+    reject_sealed_rows("expenses", stored)
+    if pending:
+        get_write_queue().cancel("expenses", pending)
+    delete_rows("expenses", "expense_id", stored)
+    bump_table_version("expenses")
 
 # --- Income ---
 def add_income(date, customer, amount, payment_method, comment):
-    supabase.table("income").insert({
+    get_write_queue().enqueue("income", checked_row("income", {
         "date": date,
         "customer": customer,
         "amount": amount,
         "payment_method": payment_method,
         "comment": comment
-    }).execute()
+    }))
 """
 def get_income():
     res = supabase.table("income").select("*").order("date", desc=True).execute()
@@ -57,24 +523,56 @@ def get_income():
         df["date"] = df["date"].apply(lambda d: format_date_str(d))
     return df
 """
-def get_income():
-    res = supabase.table("income").select("*").order("date", desc=True).execute()
-    df = pd.DataFrame(res.data)
-    return df
-    
+def get_income(limit=None, offset=0):
+    """Newest-first income, pending ones first; pass offset/limit to get one page of rows."""
+    return cached_read(("income", offset, limit), ["income", "pending:income"],
+                       lambda: page_of(with_pending("income", synced_table("income")), offset, limit))
+
 def save_income(df):
-    allowed_columns = ["order_id", "date", "customer", "amount", "payment_method", "comment"]
-    df = df[allowed_columns]
-    data = df.to_dict(orient="records")
-    for row in data:
-        order_id = row["order_id"]
-        supabase.table("income").update(row).eq("order_id", order_id).execute()
+    """Upsert the given (changed) income rows in bulk, keyed on income_id; raises ValidationError if any is invalid.
+
+    Returns the number of rows written; rows still in the write-behind queue are skipped.
+    """
+    allowed_columns = ["income_id", "order_id", "date", "customer", "amount", "payment_method", "comment"]
+    df = confirmed_rows(df[allowed_columns], "income_id").assign(date=lambda d: to_db(d["date"]))
+    require_valid("income", df, sealed_date("income"))
+    reject_sealed_rows("income", df["income_id"])
+    upsert_rows("income", to_records(df), "income_id")
+    bump_table_version("income")
+    return len(df)
+
+def delete_income(income_ids):
+    stored, pending = split_pending(income_ids)
+    reject_sealed_rows("income", stored)
+    if pending:
+        get_write_queue().cancel("income", pending)
+    delete_rows("income", "income_id", stored)
+    bump_table_version("income")
+
+# --- Summary ---
+def get_monthly_summary():
+    """Monthly expense/income totals from the trigger-maintained monthly_summary table."""
+    return cached_read("monthly_summary", ["expenses", "income"], _fetch_monthly_summary)
+
+def _fetch_monthly_summary():
+    rows = backend.select_all("monthly_summary", "month")
+    return decode_frame("monthly_summary", pd.DataFrame(rows, columns=["month", "total_expense", "total_income"]))
+
+def get_analytics_cube():
+    """Month x category / customer / payment_method rollups, rebuilt once per expenses/income version."""
+    return cached_read("analytics_cube", ["expenses", "income"],
+                       lambda: AnalyticsCube(synced_table("expenses"), synced_table("income")), copy=False)
+
+def get_customer_ledger():
+    """Receivables per customer (open orders joined with income), rebuilt once per orders/income version."""
+    return cached_read("customer_ledger", ["orders", "income"],
+                       lambda: CustomerLedger(synced_table("orders"), synced_table("income")), copy=False)
 
 # --- Orders ---
 def add_order(delivery_date, customer, item, price, advance, description):
     pending = price - advance
    
-    supabase.table("orders").insert({
+    get_write_queue().enqueue("orders", checked_row("orders", {
         "delivery_date": delivery_date   ,
         "customer": customer,
         "item": item,
@@ -83,44 +581,43 @@ def add_order(delivery_date, customer, item, price, advance, description):
         "pending_balance": pending,
         "description": description,
         "delivered": False
-    }).execute()
+    }))
 
 def get_orders():
-    res = supabase.table("orders").select("*").order("delivery_date", desc=True).execute()
-    df = pd.DataFrame(res.data)
-    if not df.empty:
-        df["delivery_date"] = pd.to_datetime(df["delivery_date"]).dt.strftime("%d-%m-%Y")
-    return df
+    """Orders with delivery_date left as the DB's ISO string; format it for display at render time."""
+    return cached_read(("orders", None), ["orders", "pending:orders"], lambda: with_pending("orders", synced_table("orders")))
 
 def mark_order_delivered(order_id):
-    supabase.table("orders").update({"delivered": True}).eq("order_id", int(order_id)).execute()
+    backend.update("orders", {"delivered": True}, "order_id", int(order_id))
+    bump_table_version("orders")
 
 def move_order_to_income(order_id):
-    res = supabase.table("orders").select("*").eq("order_id", int(order_id)).execute()
-    if not res.data:
+    if not settle_orders([order_id]):
         print("No order found with that ID", order_id)
-        return
-    
-    order = res.data[0]
+
+def settle_orders(order_ids, payment_method="UPI"):
+    """Move orders into income and delete them, atomically, in one database call.
+
+    Returns the number of orders settled. Each income row is dated by its
+    order's delivery date, so orders delivered in a sealed period are
+    rejected (ValidationError) rather than settled into the archive's range.
+    """
+    ids = [int(i) for i in order_ids]
+    if not ids:
+        return 0
+    reject_sealed_settles(ids)
     try:
-        supabase.table("income").insert({
-            "order_id": order["order_id"],
-            "date": order["delivery_date"],
-            "customer": order["customer"],
-            "amount": order["price"],
-            "payment_method": "UPI",
-            "comment": order["description"]
-        }).execute()
-        print("Insert into income succeeded")
+        settled = backend.settle_orders(ids, payment_method)
     except Exception as e:
-        print(f"Insert into income failed: {e}")
+        print(f"Settling orders {ids} failed: {e}")
         raise
-    
-    supabase.table("orders").delete().eq("order_id", int(order_id)).execute()
+    bump_table_version("orders")
+    bump_table_version("income")
+    return settled
 
 def update_order(order_id, delivery_date, customer, item, price, advance, description):
     pending = price - advance
-    supabase.table("orders").update({
+    backend.update("orders", checked_row("orders", {
         "delivery_date": delivery_date,
         "customer": customer,
         "item": item,
@@ -128,7 +625,18 @@ def update_order(order_id, delivery_date, customer, item, price, advance, descri
         "advance": advance,
         "pending_balance": pending,
         "description": description
-    }).eq("order_id", int(order_id)).execute()
+    }), "order_id", int(order_id))
+    bump_table_version("orders")
 
 def cancel_order(order_id):
-    supabase.table("orders").delete().eq("order_id", int(order_id)).execute()
+    stored, pending = split_pending([order_id])
+    if pending:
+        get_write_queue().cancel("orders", pending)
+        return
+    backend.delete("orders", "order_id", stored)
+    bump_table_version("orders")
+
+
+# --- Instrumentation ---
+# Every function above records a timing span (see utils/instrumentation.py).
+instrument_module(globals())
@@ -0,0 +1,25 @@
+"""Each data-layer test runs against its own SQLite file and archive directory."""
+import os
+import tempfile
+
+# read at import time by supabasedbutil; keep the write-behind journal out of the working tree
+os.environ.setdefault("WRITE_JOURNAL_PATH", os.path.join(tempfile.mkdtemp(prefix="finance-tests-"), "pending_writes.db"))
+os.environ.setdefault("PERF_LOG_LEVEL", "WARNING")
+
+import pytest
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """supabasedbutil wired to a fresh, migrated SQLite database."""
+    import archive
+    import supabasedbutil
+    from backends.sql_backend import SqlBackend
+
+    monkeypatch.setattr(archive, "ARCHIVE_DIR", tmp_path / "history")
+    monkeypatch.setattr(supabasedbutil, "backend", SqlBackend.sqlite(tmp_path / "finance.db"))
+    supabasedbutil.reset_sync_state()
+    supabasedbutil.clear_read_cache()
+    yield supabasedbutil
+    supabasedbutil.reset_sync_state()
+    supabasedbutil.clear_read_cache()
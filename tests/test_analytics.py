@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+from utils.analytics import AnalyticsCube
+
+EXPENSES = pd.DataFrame({
+    "date": pd.to_datetime(["2025-01-05", "2025-01-20", "2025-03-02", "2026-01-10"]),
+    "category": pd.Categorical(["Flour", "Milk", "Flour", "Flour"]),
+    "amount": [1000, 500, 700, 1200],
+})
+INCOME = pd.DataFrame({
+    "date": pd.to_datetime(["2025-01-15", "2025-03-20", "2026-01-15"]),
+    "customer": pd.Categorical(["Asha", "Ravi", "Asha"]),
+    "payment_method": pd.Categorical(["UPI", None, "Cash"]),
+    "amount": [5000, 2000, 4000],
+})
+
+
+def test_totals_cover_every_month_in_range():
+    cube = AnalyticsCube(EXPENSES, INCOME)
+    totals = cube.totals
+    assert len(totals) == 13  # Jan 2025 .. Jan 2026, quiet months zero-filled
+    assert totals.loc[pd.Period("2025-01", "M")].tolist() == [1500, 5000, 3500]
+    assert totals.loc[pd.Period("2025-02", "M")].tolist() == [0, 0, 0]
+    assert totals["net"].sum() == 11000 - 3400
+
+
+def test_breakdown_and_trend():
+    cube = AnalyticsCube(EXPENSES, INCOME)
+    assert cube.members("Payment method") == ["(none)", "Cash", "UPI"]
+    breakdown = cube.breakdown("Expense category")
+    assert breakdown.index.tolist() == ["Flour", "Milk"]
+    assert breakdown["amount"].tolist() == [2900, 500]
+    assert breakdown["count"].tolist() == [3, 1]
+    assert cube.breakdown("Customer", pd.Period("2025-03", "M"))["amount"].to_dict() == {"Ravi": 2000}
+
+    trend = cube.trend("Customer", "Asha")
+    assert trend.index.equals(cube.totals.index)
+    assert trend.sum() == 9000 and trend[pd.Period("2025-02", "M")] == 0
+
+
+def test_year_over_year_and_rolling():
+    cube = AnalyticsCube(EXPENSES, INCOME)
+    table, change = cube.year_over_year("expense")
+    assert table.loc[1].tolist() == [1500, 1200]
+    assert change.loc[1, 2026] == pytest.approx(-20)
+
+    rolling = cube.rolling(2)
+    assert rolling["expense"].iloc[0] == 1500  # partial window
+    assert rolling["expense"].iloc[1] == 750
+
+
+def test_empty_frames():
+    cube = AnalyticsCube(pd.DataFrame(), pd.DataFrame())
+    assert cube.months == []
+    assert cube.breakdown("Customer").empty
@@ -0,0 +1,23 @@
+import pandas as pd
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+from utils import bulk_io
+
+
+def test_export_csv_is_accepted_by_download_button(monkeypatch):
+    pages = [
+        pd.DataFrame({"expense_id": [2, 1], "date": ["2025-01-02", "2025-01-01"], "amount": [10.5, 4]}),
+        pd.DataFrame({"expense_id": [0], "date": ["2024-12-31"], "amount": [1]}),
+    ]
+    monkeypatch.setattr(bulk_io, "iter_table_pages", lambda table, start=None, end=None: iter(pages))
+
+    # st.download_button calls data=lambda: export_csv(...) and converts the result like this
+    data = (lambda: bulk_io.export_csv("expenses"))()
+    with data:
+        content, _ = convert_data_to_bytes_and_infer_mime(data, RuntimeError("unsupported type"))
+
+    assert content.decode() == (
+        "expense_id,date,amount\n"
+        "2,2025-01-02,10.5\n"
+        "1,2025-01-01,4.0\n"
+        "0,2024-12-31,1\n"
+    )
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+from utils.customer_ledger import CustomerLedger
+
+ORDERS = pd.DataFrame({
+    "order_id": [3, 2],
+    "delivery_date": pd.to_datetime(["2026-03-10", "2026-02-01"]),
+    "customer": pd.Categorical(["Priya Sharma", "Ravi"]),
+    "advance": [500, 0],
+    "pending_balance": [1500, 800],
+})
+INCOME = pd.DataFrame({
+    "income_id": [7, 6],
+    "order_id": [1, None],
+    "date": pd.to_datetime(["2026-03-01", "2026-01-15"]),
+    "customer": pd.Categorical(["priya  sharma", "Meena"]),
+    "amount": [2000, 300],
+})
+
+
+def test_joins_orders_and_income_per_normalized_customer():
+    ledger = CustomerLedger(ORDERS, INCOME)
+    priya = ledger.get("PRIYA SHARMA")
+    assert priya.name == "Priya Sharma"  # spelling on the latest order
+    assert (priya.open_orders, priya.outstanding, priya.advance_held) == (1, 1500, 500)
+    assert (priya.payments, priya.lifetime_revenue) == (1, 2000)
+    assert priya.last_order_date == pd.Timestamp("2026-03-10")
+    # income without an order is a payment, not an order
+    assert pd.isna(ledger.last_order_date("Meena"))
+    assert ledger.outstanding("nobody") == 0
+
+
+@pytest.mark.parametrize("empty", [INCOME.iloc[0:0], pd.DataFrame()])
+def test_no_income_yet(empty):
+    ledger = CustomerLedger(ORDERS, empty)
+    assert len(ledger) == 2
+    assert ledger.last_order_date("ravi") == pd.Timestamp("2026-02-01")
+    assert ledger.lifetime_revenue("ravi") == 0
+
+
+@pytest.mark.parametrize("empty", [ORDERS.iloc[0:0], pd.DataFrame()])
+def test_every_order_settled(empty):
+    ledger = CustomerLedger(empty, INCOME)
+    assert len(ledger) == 2
+    assert ledger.last_order_date("priya sharma") == pd.Timestamp("2026-03-01")
+    assert ledger.outstanding("priya sharma") == 0
+    assert ledger.orders_of("priya sharma").empty
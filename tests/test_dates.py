@@ -0,0 +1,39 @@
+import datetime
+import pandas as pd
+import pytest
+from utils.dates import detect_format, parse_dates, to_date_objects, to_db, to_display
+
+
+@pytest.mark.parametrize("values, expected", [
+    (["2025-01-02", "2025-12-31"], "ISO8601"),
+    (["2025-01-02 10:00:00", "2025-01-03T08:30:00"], "ISO8601"),
+    (["02-01-2025", "31-12-2025"], "%d-%m-%Y"),
+    (["2025/01/02", "2025/12/31"], "%Y/%m/%d"),
+    # the format most of the sample is in wins
+    (["02-01-2025", "03-01-2025", "2025-01-04"], "%d-%m-%Y"),
+    (["Jan 2, 2025"], None),
+    ([None, ""], "ISO8601"),
+])
+def test_detect_format(values, expected):
+    assert detect_format(pd.Series(values, dtype=object)) == expected
+
+
+def test_each_column_is_parsed_in_its_own_format():
+    # 03-04 is 3 April in display order, never March 4
+    assert parse_dates(["03-04-2025", "31-12-2025"]).tolist() == [pd.Timestamp("2025-04-03"), pd.Timestamp("2025-12-31")]
+    assert parse_dates(["2025-04-03", None, "garbage"]).tolist()[0] == pd.Timestamp("2025-04-03")
+    assert parse_dates(["2025-04-03", None, "garbage"]).isna().tolist() == [False, True, True]
+    # unknown shapes fall back to per-value, day-first parsing
+    assert parse_dates(["3.4.2025"]).tolist() == [pd.Timestamp("2025-04-03")]
+
+
+def test_date_objects_and_datetimes_pass_through():
+    typed = pd.Series(pd.to_datetime(["2025-04-03"]))
+    assert parse_dates(typed).equals(typed)
+    assert parse_dates([datetime.date(2025, 4, 3), None]).tolist()[0] == pd.Timestamp("2025-04-03")
+
+
+def test_round_trip_between_display_and_db():
+    assert to_display(["2025-04-03", None]).tolist() == ["03-04-2025", ""]
+    assert to_db(["03-04-2025", ""]).tolist() == ["2025-04-03", None]
+    assert to_date_objects(["2025-04-03"]).tolist() == [datetime.date(2025, 4, 3)]
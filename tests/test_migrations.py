@@ -0,0 +1,32 @@
+from sqlalchemy import create_engine, text
+import migrations
+from migrations import apply_migrations, applied_versions, existing_indexes, migration_files, missing_indexes, pending_migrations
+
+
+def test_fresh_database_gets_every_migration(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'finance.db'}")
+    versions = [version for version, _ in migration_files(engine)]
+    assert apply_migrations(engine) == versions
+    assert missing_indexes(engine) == []
+    assert apply_migrations(engine) == []
+
+
+def test_existing_database_upgrades_and_keeps_its_rows(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'finance.db'}")
+    files = migration_files(engine)
+    # a database last migrated when only the first file existed
+    monkeypatch.setattr(migrations, "migration_files", lambda engine: files[:1])
+    apply_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO expenses (date, category, amount) VALUES ('2025-01-02', 'Milk', 40)"))
+    monkeypatch.undo()
+
+    assert [version for version, _ in pending_migrations(engine)] == [version for version, _ in files[1:]]
+    assert apply_migrations(engine) == [version for version, _ in files[1:]]
+    assert applied_versions(engine) == {version for version, _ in files}
+    assert missing_indexes(engine) == []
+    # dropped again by a later migration: nothing queries them
+    assert not existing_indexes(engine) & {"income_order_id", "orders_customer", "income_customer"}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT category, amount FROM expenses")).fetchall() == [("Milk", 40)]
+        assert conn.execute(text("SELECT total_expense FROM monthly_summary")).scalar() == 40
@@ -0,0 +1,39 @@
+import datetime
+import pandas as pd
+from utils.order_index import OrderIndex
+
+ORDERS = pd.DataFrame({
+    "order_id": [11, 12, 13, 14],
+    "delivery_date": ["2025-03-10", "2025-01-05", "not a date", "2025-02-20"],
+    "customer": ["Asha Rao", "Ravi", "Asha Rao", "Meena"],
+    "item": ["Silk blouse", "Kurta", "Lehenga", "Silk saree"],
+})
+
+
+def ids(index, positions):
+    return index.df["order_id"].iloc[positions].tolist()
+
+
+def test_rows_are_sorted_by_delivery_date_with_undated_last():
+    index = OrderIndex(ORDERS)
+    assert index.df["order_id"].tolist() == [12, 14, 11, 13]
+    assert index.df["delivery_display"].tolist() == ["05-01-2025", "20-02-2025", "10-03-2025", ""]
+    assert index.date_position(datetime.date(2025, 2, 1)) == 1
+    assert index.date_position(datetime.date(2026, 1, 1)) == 3
+
+
+def test_search_matches_word_prefixes_within_a_date_range():
+    index = OrderIndex(ORDERS)
+    assert ids(index, index.search()) == [12, 14, 11]  # the undated row is left out
+    assert ids(index, index.search("sil")) == [14, 11]
+    assert ids(index, index.search("asha SILK")) == [11]
+    assert ids(index, index.search("14")) == [14]
+    assert ids(index, index.search("silk", end=datetime.date(2025, 3, 1))) == [14]
+    assert ids(index, index.search("", start=datetime.date(2025, 2, 20), end=datetime.date(2025, 3, 10))) == [14, 11]
+    assert ids(index, index.search("nobody")) == []
+
+
+def test_empty_frame_without_columns():
+    index = OrderIndex(pd.DataFrame())
+    assert len(index) == 0
+    assert index.search("asha").size == 0
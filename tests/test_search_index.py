@@ -0,0 +1,57 @@
+import pandas as pd
+from utils.search_index import TableSearchIndex
+
+
+def income(rows):
+    return pd.DataFrame(rows, columns=["income_id", "date", "customer", "description", "updated_at"]).astype(
+        {"date": "datetime64[ns]", "updated_at": "datetime64[ns]"})
+
+
+FRAME = income([
+    (1, "2026-03-02", "Asha Rao", "blouse stitching", "2026-03-02 10:00"),
+    (2, "2026-04-10", "Ravi", "saree fall", "2026-04-10 09:00"),
+    (-1, "2026-04-11", "Asha Rao", "queued", "2026-04-11 09:00"),
+])
+
+
+def new_index():
+    return TableSearchIndex(["customer", "description"], "date", "income_id")
+
+
+def test_matches_every_word_as_a_prefix_newest_first():
+    index = new_index()
+    index.refresh(FRAME)
+    assert index.search("asha march")["income_id"].tolist() == [1]
+    assert index.search("sa")["income_id"].tolist() == [2]
+    assert index.search("2026")["income_id"].tolist() == [2, 1]  # pending rows aren't searchable
+
+
+def test_refresh_reindexes_changed_and_removed_rows():
+    index = new_index()
+    index.refresh(FRAME)
+    edited = FRAME.iloc[[0]].assign(customer="Meena", updated_at=pd.Timestamp("2026-05-01"))
+    index.refresh(edited)
+    assert index.search("asha").empty
+    assert index.search("meena")["income_id"].tolist() == [1]
+    assert index.search("ravi").empty
+
+
+def test_frame_without_columns_empties_the_index():
+    index = new_index()
+    index.refresh(FRAME)
+    index.refresh(pd.DataFrame())
+    assert index.search("asha").empty
+    index.refresh(FRAME)
+    assert index.search("asha")["income_id"].tolist() == [1]
+
+
+def test_failed_refresh_is_retried_with_the_same_frame(monkeypatch):
+    index = new_index()
+    monkeypatch.setattr(index, "_add", lambda rows: (_ for _ in ()).throw(RuntimeError("boom")))
+    try:
+        index.refresh(FRAME)
+    except RuntimeError:
+        pass
+    monkeypatch.undo()
+    index.refresh(FRAME)
+    assert index.search("ravi")["income_id"].tolist() == [2]
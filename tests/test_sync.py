@@ -0,0 +1,94 @@
+import pytest
+from utils.validation import ValidationError
+from utils.table_schema import TABLE_SCHEMAS
+
+
+def test_empty_table_is_typed(db):
+    for table in ("expenses", "income", "orders"):
+        df = db.synced_table(table)
+        assert df.empty
+        assert list(df.columns) == list(TABLE_SCHEMAS[table])
+    df = db.synced_table("orders")
+    assert df["order_id"].dtype == "int32"
+    assert df["price"].dtype == "int64"
+    assert df["customer"].dtype == "category"
+
+
+def test_delta_sync_applies_inserts_updates_and_deletes(db):
+    db.insert_rows("expenses", [
+        {"date": "2026-01-05", "category": "Flour", "amount": 10.5, "comment": None},
+        {"date": "2026-01-06", "category": "Milk", "amount": 4, "comment": "weekly"},
+    ])
+    df = db.synced_table("expenses")
+    assert df["category"].tolist() == ["Milk", "Flour"]  # newest first
+    assert df["amount"].tolist() == [400, 1050]  # paise
+
+    flour = int(df.loc[df["category"] == "Flour", "expense_id"].iloc[0])
+    db.save_expenses(df.pipe(lambda d: db.encode_frame("expenses", d))
+                     .loc[lambda d: d["expense_id"] == flour].assign(amount=12.0))
+    df = db.synced_table("expenses")
+    assert df.loc[df["expense_id"] == flour, "amount"].tolist() == [1200]
+
+    db.delete_expenses([flour])
+    assert db.synced_table("expenses")["category"].tolist() == ["Milk"]
+
+
+def test_all_rows_tombstoned_keeps_columns(db):
+    db.insert_rows("income", [{"date": "2026-02-01", "customer": "Asha", "amount": 100,
+                               "payment_method": "UPI", "comment": None}])
+    ids = db.synced_table("income")["income_id"].tolist()
+    db.delete_income(ids)
+    df = db.synced_table("income")
+    assert df.empty
+    assert list(df.columns) == list(TABLE_SCHEMAS["income"])
+    assert db.search_records("asha")["income"].empty
+
+
+def test_unchanged_table_is_the_same_frame(db):
+    db.insert_rows("expenses", [{"date": "2026-01-05", "category": "Flour", "amount": 10, "comment": None}])
+    df = db.synced_table("expenses")
+    assert db.synced_table("expenses") is df
+
+
+def test_writes_from_elsewhere_are_picked_up_after_the_ttl(db, monkeypatch):
+    db.insert_rows("expenses", [{"date": "2026-01-05", "category": "Flour", "amount": 10, "comment": None}])
+    df = db.synced_table("expenses")
+    # another app instance: nothing bumps this process's table version
+    db.backend.insert("expenses", [{"date": "2026-01-07", "category": "Oil", "amount": 3, "comment": None}])
+    assert db.synced_table("expenses") is df
+
+    monkeypatch.setattr(db, "CACHE_TTL_SECONDS", 0)
+    assert db.synced_table("expenses")["category"].tolist() == ["Oil", "Flour"]
+
+
+def test_sealed_rows_come_from_the_archive(db):
+    db.insert_rows("income", [
+        {"date": "2025-01-10", "customer": "Asha", "amount": 100, "payment_method": "UPI", "comment": None},
+        {"date": "2025-02-10", "customer": "Ravi", "amount": 50, "payment_method": "Cash", "comment": None},
+    ])
+    db.seal_period("2025-01-31")
+    db.insert_rows("income", [{"date": "2025-03-01", "customer": "Meena", "amount": 20, "payment_method": "UPI", "comment": None}])
+
+    df = db.synced_table("income")
+    assert df["customer"].tolist() == ["Meena", "Ravi", "Asha"]
+    assert df["customer"].dtype == "category"
+    assert db.archived_table("income")["customer"].tolist() == ["Asha"]
+
+def test_settling_into_a_sealed_period_is_rejected(db):
+    db.insert_rows("orders", [
+        {"delivery_date": "2025-01-10", "customer": "Asha", "item": "blouse", "price": 1200, "advance": 200,
+         "pending_balance": 1000, "description": "", "delivered": False},
+        {"delivery_date": "2025-03-10", "customer": "Ravi", "item": "kurta", "price": 800, "advance": 0,
+         "pending_balance": 800, "description": "", "delivered": False},
+    ])
+    db.seal_period("2025-01-31")
+    orders = db.synced_table("orders")
+    sealed_id, open_id = orders.sort_values("delivery_date")["order_id"].tolist()
+
+    with pytest.raises(ValidationError) as e:
+        db.settle_orders([sealed_id, open_id])
+    assert e.value.problems["row"].tolist() == [sealed_id]
+    assert len(db.synced_table("orders")) == 2
+
+    assert db.settle_orders([open_id]) == 1
+    assert db.synced_table("income")["order_id"].tolist() == [open_id]
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+from utils.validation import ValidationError, require_valid, split_valid, validate_frame
+
+
+def problems_of(table, rows, **kwargs):
+    found = validate_frame(table, pd.DataFrame(rows), **kwargs)
+    return sorted(zip(found["row"], found["column"], found["message"]))
+
+
+def test_valid_rows_have_no_problems():
+    rows = [
+        {"date": "2025-01-02", "category": "Flour", "amount": "1,250.50", "comment": None},
+        {"date": "2025-01-03", "category": "Milk", "amount": 40, "comment": "weekly"},
+    ]
+    assert problems_of("expenses", rows) == []
+
+
+def test_every_offending_cell_is_reported():
+    rows = [
+        {"date": "not a date", "category": " ", "amount": "-5"},
+        {"date": "2025-01-02", "category": "x" * 101, "amount": "12abc"},
+        {"date": None, "category": "Milk", "amount": 10 ** 10},
+    ]
+    assert problems_of("expenses", rows) == [
+        (0, "amount", "must not be negative"),
+        (0, "category", "is required"),
+        (0, "date", "is not a valid date"),
+        (1, "amount", "is not a number"),
+        (1, "category", "is longer than 100 characters"),
+        (2, "amount", "is too large"),
+        (2, "date", "is required"),
+    ]
+
+
+def test_missing_required_column_is_blank_in_every_row():
+    assert problems_of("income", [{"date": "2025-01-02", "customer": "Asha", "amount": 10}] * 2) == [
+        (0, "payment_method", "is required"),
+        (1, "payment_method", "is required"),
+    ]
+
+
+def test_pending_balance_must_equal_price_minus_advance():
+    rows = [
+        {"delivery_date": "2025-01-02", "customer": "Asha", "item": "blouse", "price": 1000, "advance": 200, "pending_balance": 800},
+        {"delivery_date": "2025-01-02", "customer": "Asha", "item": "blouse", "price": 1000, "advance": None, "pending_balance": 1000},
+        {"delivery_date": "2025-01-02", "customer": "Asha", "item": "blouse", "price": 1000, "advance": 200, "pending_balance": 1000},
+    ]
+    assert problems_of("orders", rows) == [(2, "pending_balance", "must equal price - advance")]
+
+
+def test_sealed_dates_are_rejected():
+    rows = [{"date": "2025-01-31", "category": "Milk", "amount": 1}, {"date": "2025-02-01", "category": "Milk", "amount": 1}]
+    assert problems_of("expenses", rows, sealed_through="2025-01-31") == [
+        (0, "date", "is in a sealed period (through 2025-01-31)"),
+    ]
+
+
+def test_split_and_require_valid():
+    df = pd.DataFrame([{"date": "2025-01-02", "category": "Milk", "amount": 1},
+                       {"date": "2025-01-02", "category": "Milk", "amount": -1}], index=[10, 11])
+    valid, problems = split_valid("expenses", df)
+    assert valid.index.tolist() == [10]
+    assert problems["row"].tolist() == [11]
+
+    require_valid("expenses", valid)
+    with pytest.raises(ValidationError, match="amount must not be negative") as e:
+        require_valid("expenses", df)
+    assert e.value.problems.equals(problems)
@@ -0,0 +1,97 @@
+import threading
+import time
+import pytest
+from utils import write_queue
+from utils.write_queue import InFlightError, WriteQueue, backoff_seconds
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+class Recorder:
+    """flush() for a WriteQueue: records what it inserts, failing while .error is set."""
+
+    def __init__(self):
+        self.rows = []
+        self.attempts = 0
+        self.error = None
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+
+    def __call__(self, table, rows):
+        self.attempts += 1
+        self.started.set()
+        assert self.release.wait(5)
+        if self.error:
+            raise self.error
+        self.rows += [(table, row) for row in rows]
+
+
+def test_enqueued_rows_are_flushed_in_the_background(tmp_path):
+    flush, changed = Recorder(), []
+    queue = WriteQueue(tmp_path / "journal.db", flush, changed.append)
+
+    journal_id = queue.enqueue("expenses", {"amount": 10, "date": "2025-01-02"})
+    assert journal_id > 0
+    wait_for(lambda: not queue.pending("expenses"))
+
+    assert flush.rows == [("expenses", {"amount": 10, "date": "2025-01-02"})]
+    assert changed.count("expenses") >= 2  # once journaled, once flushed
+    assert queue.counts() == {"pending": 0, "failed": 0}
+
+
+def test_failed_flush_backs_off_then_gives_up_until_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(write_queue, "RETRY_BASE_SECONDS", 0.01)
+    monkeypatch.setattr(write_queue, "MAX_ATTEMPTS", 3)
+    flush = Recorder()
+    flush.error = ConnectionError("db unreachable")
+    queue = WriteQueue(tmp_path / "journal.db", flush)
+
+    queue.enqueue("income", {"amount": 5})
+    wait_for(lambda: queue.counts()["failed"] == 1)
+    assert flush.attempts == 3
+    [(_, row, error)] = queue.pending("income")
+    assert (row, error) == ({"amount": 5}, "db unreachable")
+
+    flush.error = None
+    queue.retry()
+    wait_for(lambda: not queue.pending("income"))
+    assert flush.rows == [("income", {"amount": 5})]
+
+
+def test_backoff_doubles_up_to_the_cap():
+    for attempts in range(1, 12):
+        delay = min(write_queue.RETRY_BASE_SECONDS * 2 ** (attempts - 1), write_queue.RETRY_MAX_SECONDS)
+        assert delay / 2 <= backoff_seconds(attempts) <= delay
+
+
+def test_cancel_drops_entries_not_yet_sent(tmp_path):
+    flush = Recorder()
+    flush.error = ConnectionError("db unreachable")  # default backoff keeps the entry waiting
+    queue = WriteQueue(tmp_path / "journal.db", flush)
+
+    journal_id = queue.enqueue("orders", {"customer": "Asha"})
+    wait_for(lambda: queue.pending("orders")[0][2] is not None)
+    queue.cancel("orders", [journal_id])
+    assert queue.pending("orders") == []
+
+
+def test_cancel_during_a_flush_raises_and_keeps_the_row(tmp_path):
+    flush = Recorder()
+    flush.release.clear()
+    queue = WriteQueue(tmp_path / "journal.db", flush)
+
+    journal_id = queue.enqueue("orders", {"customer": "Asha"})
+    assert flush.started.wait(5)
+    with pytest.raises(InFlightError) as e:
+        queue.cancel("orders", [journal_id])
+    assert e.value.ids == [journal_id]
+
+    flush.release.set()
+    wait_for(lambda: not queue.pending("orders"))
+    assert flush.rows == [("orders", {"customer": "Asha"})]
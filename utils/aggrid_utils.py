@@ -1,37 +1,206 @@
-from st_aggrid import GridOptionsBuilder, AgGrid, GridUpdateMode
+from st_aggrid import GridOptionsBuilder, AgGrid, GridUpdateMode, DataReturnMode, JsCode
+import json
 import pandas as pd
 import streamlit as st
-from utils.formatters import format_date_str
+from utils.dates import parse_dates, to_display, to_db
+from utils.validation import ValidationError, split_valid
+from utils.write_queue import InFlightError
 
-def editable_grid(df, save_func, grid_options_builder, delete_enabled=False, grid_key="default_grid"):
+GRID_PAGE_SIZE = 50
+
+# Edits stay in the browser until "Send changes" (the grid's manual update
+# button) is pressed; then only the edited rows and the selected keys come back.
+_TRACK_EDITS = """
+function(params) {
+    params.api.__editedIds = params.api.__editedIds || new Set();
+    params.api.__editedIds.add(params.node.id);
+}
+"""
+# Rows rejected by the last save (REJECTED_IDS) are sent again with the next change set.
+_COLLECT_CHANGES = """
+function({streamlitRerunEventTriggerName, eventData}) {
+    const api = eventData.api;
+    const edited = new Set([...(api.__editedIds || []), ...REJECTED_IDS]);
+    const changes = [];
+    api.forEachNode(node => { if (edited.has(node.id)) changes.push(node.data); });
+    return {changes: changes, selected: api.getSelectedNodes().map(node => node.id)};
+}
+"""
+# Cells that failed validation (PROBLEMS: row id -> column -> message) are shaded, with the message as tooltip.
+_PROBLEM_STYLE = """
+function(params) {
+    const problems = PROBLEMS[params.node.id];
+    if (problems && problems[params.colDef.field]) return {backgroundColor: '#f8d7da'};
+}
+"""
+# Rows of archived (sealed) periods, LOCKED_IDS, can't be edited or selected.
+_UNLOCKED = """
+function(params) {
+    return !LOCKED_IDS.includes((params.node || params).id);
+}
+"""
+_ROW_STYLE = """
+function(params) {
+    if (params.node.id === FOCUS_ID) return {background: '#fff3b0'};
+    if (LOCKED_IDS.includes(params.node.id)) return {color: '#888'};
+}
+"""
+_PROBLEM_TOOLTIP = """
+function(params) {
+    const problems = PROBLEMS[params.node.id];
+    return problems ? problems[params.colDef.field] : undefined;
+}
+"""
+
+def grid_page(grid_key, total_rows):
+    """Offset of the page of rows a grid shows, with a page picker when there is more than one."""
+    pages = max((total_rows - 1) // GRID_PAGE_SIZE + 1, 1)
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages}, {total_rows} rows)", min_value=1, max_value=pages, value=1, key=f"grid_page_{grid_key}_{pages}")
+    return (page - 1) * GRID_PAGE_SIZE
+
+@st.fragment
+def editable_grid(df, save_func, grid_options_builder, key_column, delete_func=None, grid_key="default_grid", table=None,
+                  sealed_through=None):
+    """Editable AgGrid over one page of rows (see grid_page), committed manually.
+
+    Nothing reruns while cells are edited; the change set sent back holds just
+    the edited rows, so saving costs the same however large the table is.
+    With table given, the change set is validated as a whole before saving
+    (see utils/validation.py): valid rows are saved in one batch, rejected
+    rows stay in the grid as edited with their offending cells shaded.
+    Rows dated on or before sealed_through (an ISO date, see archive/) are
+    read-only and can't be selected.
+    """
     if df.empty:
         st.info("No records found.")
         return
-    gb = grid_options_builder
+    locked = []
+    if sealed_through is not None:
+        locked = df.loc[(parse_dates(df["date"]) <= pd.Timestamp(sealed_through)).to_numpy(), key_column]
+        locked = [str(row_id) for row_id in locked]
+    df["date"] = to_display(df["date"])
+    original_df = df.copy()
+    df, problems = _with_rejected(df, key_column, st.session_state.get(f"grid_rejected_{grid_key}"))
 
-    df["date"] = df["date"].apply(lambda d: format_date_str(d))
+    gb = grid_options_builder
+    gb.configure_grid_options(
+        getRowId=JsCode(f"function(params) {{ return String(params.data[{key_column!r}]); }}"),
+        onCellValueChanged=JsCode(_TRACK_EDITS),
+    )
+    gb.configure_default_column(
+        cellStyle=JsCode(_PROBLEM_STYLE.replace("PROBLEMS", json.dumps(problems))),
+        tooltipValueGetter=JsCode(_PROBLEM_TOOLTIP.replace("PROBLEMS", json.dumps(problems))),
+    )
+    if locked:
+        gb.configure_default_column(editable=JsCode(_UNLOCKED.replace("LOCKED_IDS", json.dumps(locked))))
+        gb.configure_grid_options(isRowSelectable=JsCode(_UNLOCKED.replace("LOCKED_IDS", json.dumps(locked))))
+        st.caption(f"Rows dated on or before {to_display([sealed_through]).iloc[0]} are archived and read-only.")
+    # a row opened from the global search box is highlighted, archived rows are greyed out
+    focus = st.session_state.get(f"grid_focus_{grid_key}")
+    gb.configure_grid_options(getRowStyle=JsCode(
+        _ROW_STYLE.replace("FOCUS_ID", json.dumps(None if focus is None else str(int(focus))))
+                  .replace("LOCKED_IDS", json.dumps(locked))))
 
+    written, skipped = st.session_state.pop(f"grid_saved_{grid_key}", (0, 0))
+    if written:
+        st.success(f"Saved {written} changed row(s) successfully!")
+    if skipped:
+        st.warning(f"{skipped} row(s) not saved: new entries can be edited once they reach the database.")
+    deleted = st.session_state.pop(f"grid_deleted_{grid_key}", 0)
+    if deleted:
+        st.success(f"Deleted {deleted} record(s) successfully!")
+    if problems:
+        st.error(f"{len(problems)} row(s) were not saved. Fix the shaded cells and save again.")
+        st.dataframe(pd.DataFrame(
+            [(row_id, column, message) for row_id, cells in problems.items() for column, message in cells.items()],
+            columns=[key_column, "column", "problem"]), hide_index=True)
 
+    # keyed per page (by its first row), and anew after each save so the change set starts empty
+    commits = st.session_state.setdefault(f"grid_commits_{grid_key}", 0)
     grid = AgGrid(
         df,
         gridOptions=gb.build(),
-        update_mode=GridUpdateMode.VALUE_CHANGED | GridUpdateMode.SELECTION_CHANGED,
-        fit_columns_on_grid_load=True
+        update_mode=GridUpdateMode.MANUAL,
+        update_on=[],
+        data_return_mode=DataReturnMode.CUSTOM,
+        custom_jscode_for_grid_return=JsCode(_COLLECT_CHANGES.replace("REJECTED_IDS", json.dumps(list(problems)))),
+        allow_unsafe_jscode=True,
+        fit_columns_on_grid_load=True,
+        key=f"grid_{grid_key}_{df[key_column].iloc[0]}_{commits}",
     )
-
-    updated_df = pd.DataFrame(grid["data"])
-    selected_rows = pd.DataFrame(grid["selected_rows"])
+    response = grid.raw_data or {}
+    edited_df = pd.DataFrame(response.get("changes") or [], columns=original_df.columns)
+    selected_ids = [int(i) for i in response.get("selected") or []]
+    if len(edited_df) or selected_ids:
+        st.caption(f"{len(edited_df)} edited and {len(selected_ids)} selected row(s) received.")
 
     if st.button("Save Changes", key=f"save_changes_{grid_key}"):
-        updated_df['date'] = pd.to_datetime(updated_df['date'], format="%d-%m-%Y", errors="coerce").dt.date
-        df.update(updated_df)
-        df['date'] = df['date'].apply(lambda d: d.isoformat() if pd.notnull(d) else None)
-        save_func(df)
-        st.success("Changes saved successfully!")
-
-    if delete_enabled and st.button("Delete Selected", key=f"delete_selected_{grid_key}"):
-        if not selected_rows.empty:
-            ids_to_delete = selected_rows["id"].tolist()
-            df = df[~df["id"].isin(ids_to_delete)]
-            save_func(df)
-            st.success("Selected records deleted successfully!")
+        changed_df = changed_rows(original_df, edited_df, key_column)
+        if changed_df.empty:
+            st.info("No changes to save. Press the grid's update button to send your edits first.")
+        else:
+            valid_df, found = split_valid(table, changed_df, sealed_through) if table else (changed_df, None)
+            # save_func returns how many rows it wrote: rows still in the write-behind queue are skipped
+            written = save_func(valid_df.assign(date=to_db(valid_df["date"]))) if len(valid_df) else 0
+            st.session_state[f"grid_saved_{grid_key}"] = (written, len(valid_df) - written)
+            st.session_state[f"grid_rejected_{grid_key}"] = _rejected(changed_df, found, key_column)
+            st.session_state[f"grid_commits_{grid_key}"] = commits + 1
+            st.rerun()
+
+    if delete_func is not None and st.button("Delete Selected", key=f"delete_selected_{grid_key}"):
+        if selected_ids:
+            try:
+                delete_func(selected_ids)
+            except (InFlightError, ValidationError) as e:
+                st.warning(f"Nothing deleted: {e}")
+            else:
+                # rerun so the deleted rows (and the page count) are gone from the grid
+                st.session_state[f"grid_deleted_{grid_key}"] = len(selected_ids)
+                st.session_state[f"grid_commits_{grid_key}"] = commits + 1
+                st.rerun()
+
+
+def _rejected(changed_df, problems, key_column):
+    """Rows of changed_df that failed validation, as edited, with {row id: {column: message}}."""
+    if problems is None or problems.empty:
+        return None
+    keys = changed_df.loc[problems["row"], key_column].astype(int).astype(str).to_numpy()
+    cells = {}
+    for row_id, column, message in zip(keys, problems["column"], problems["message"]):
+        cell = cells.setdefault(row_id, {})
+        cell[column] = f"{cell[column]}; {message}" if column in cell else message
+    return {"rows": changed_df.loc[problems["row"].unique()], "problems": cells}
+
+
+def _with_rejected(df, key_column, rejected):
+    """df with the rejected edits laid over their rows, and the problems of those on this page."""
+    if not rejected:
+        return df, {}
+    rows = rejected["rows"]
+    rows = rows[rows[key_column].isin(df[key_column])]
+    if rows.empty:
+        return df, {}
+    keyed = df.set_index(key_column, drop=False).astype(object)
+    keyed.loc[rows[key_column].to_numpy()] = rows.reindex(columns=keyed.columns).to_numpy()
+    problems = {row_id: rejected["problems"][row_id] for row_id in rows[key_column].astype(int).astype(str)}
+    return keyed.reset_index(drop=True), problems
+
+
+def changed_rows(original_df, updated_df, key_column):
+    """Return the rows of updated_df whose values differ from original_df, matched on key_column."""
+    columns = [c for c in original_df.columns if c in updated_df.columns]
+    if updated_df.empty or key_column not in columns:
+        return updated_df.iloc[0:0]
+
+    # Compare as strings: the grid hands values back as JSON, so dtypes don't survive the round trip.
+    before = _as_text(original_df[columns].set_index(key_column))
+    after = _as_text(updated_df[columns].set_index(key_column))
+    before = before.reindex(after.index)
+    changed = (before != after).any(axis=1).to_numpy()
+    return updated_df.loc[changed, columns].copy()
+
+
+def _as_text(df):
+    return df.astype(object).where(df.notna(), "").astype(str)
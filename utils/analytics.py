@@ -0,0 +1,86 @@
+"""Pre-aggregated month x dimension totals behind the Summary tab.
+
+Built once per expenses/income version from the typed frames; every chart
+and drill-down on the page is a slice of these small tables, so a rerun
+never groups raw rows again.  Amounts stay in integer paise.
+"""
+import numpy as np
+import pandas as pd
+
+# label -> (source, column) of each dimension the Summary tab can break down by
+DIMENSIONS = {
+    "Expense category": ("expense", "category"),
+    "Customer": ("income", "customer"),
+    "Payment method": ("income", "payment_method"),
+}
+
+MEASURES = ["expense", "income", "net"]
+
+
+def _rollup(df, column):
+    """month x column -> amount (paise) and row count, as a long frame indexed by (month, column)."""
+    df = df.reindex(columns=["date", column, "amount"])
+    months = pd.to_datetime(df["date"]).dt.to_period("M").rename("month")
+    grouped = df.groupby([months, df[column].astype(object).fillna("(none)")], observed=True)["amount"]
+    return pd.DataFrame({
+        "amount": grouped.sum().astype("int64"),
+        "count": grouped.size().astype("int64"),
+    })
+
+
+class AnalyticsCube:
+    """Monthly totals plus month x category / customer / payment_method rollups."""
+
+    def __init__(self, expenses, income):
+        self.cells = {label: _rollup(expenses if source == "expense" else income, column)
+                      for label, (source, column) in DIMENSIONS.items()}
+
+        expense = self.cells["Expense category"]["amount"].groupby(level="month").sum()
+        income_ = self.cells["Customer"]["amount"].groupby(level="month").sum()
+        months = expense.index.union(income_.index)
+        if len(months):
+            # every month in range, so rolling windows and YoY don't skip quiet months
+            months = pd.period_range(months.min(), months.max(), freq="M", name="month")
+        totals = pd.DataFrame({
+            "expense": expense.reindex(months, fill_value=0),
+            "income": income_.reindex(months, fill_value=0),
+        }, index=months).astype("int64")
+        totals["net"] = totals["income"] - totals["expense"]
+        self.totals = totals
+
+    @property
+    def months(self):
+        return list(self.totals.index)
+
+    def members(self, dimension):
+        return sorted(self.cells[dimension].index.get_level_values(1).unique())
+
+    def breakdown(self, dimension, month=None):
+        """Totals per member of a dimension for one month (or all months), largest first."""
+        cells = self.cells[dimension]
+        if month is not None:
+            cells = cells[cells.index.get_level_values("month") == month]
+        grouped = cells.groupby(level=1).sum()
+        return grouped.sort_values("amount", ascending=False)
+
+    def trend(self, dimension, member):
+        """Monthly amount of one member, zero-filled over the cube's months."""
+        cells = self.cells[dimension]
+        series = cells[cells.index.get_level_values(1) == member]["amount"].droplevel(1)
+        return series.reindex(self.totals.index, fill_value=0)
+
+    def year_over_year(self, measure):
+        """Calendar month (rows) x year (columns) of a measure, with the change against the previous year."""
+        series = self.totals[measure]
+        table = pd.DataFrame({
+            "year": series.index.year,
+            "month": series.index.month,
+            "amount": series.to_numpy(),
+        }).pivot(index="month", columns="year", values="amount")
+        # growth from a zero month is undefined, not infinite
+        change = (table.pct_change(axis=1, fill_method=None) * 100).replace([np.inf, -np.inf], np.nan)
+        return table, change
+
+    def rolling(self, window):
+        """Trailing mean of each measure over window months (partial windows at the start)."""
+        return self.totals.rolling(window, min_periods=1).mean()
@@ -0,0 +1,132 @@
+"""Chunked CSV/Excel import and streaming CSV export for expenses, income and orders."""
+import os
+import tempfile
+import pandas as pd
+import streamlit as st
+from supabasedbutil import insert_rows, iter_table_pages, sealed_date, to_records
+from utils.dates import to_db
+from utils.validation import split_valid
+
+IMPORT_CHUNK_SIZE = 5000
+
+# columns an import file must / may have, per table
+IMPORT_COLUMNS = {
+    "expenses": {
+        "required": ["date", "category", "amount"],
+        "optional": ["comment"],
+    },
+    "income": {
+        "required": ["date", "customer", "amount", "payment_method"],
+        "optional": ["order_id", "comment"],
+    },
+    "orders": {
+        "required": ["delivery_date", "customer", "item", "price"],
+        "optional": ["advance", "description"],
+    },
+}
+DATE_COLUMNS = {"date", "delivery_date"}
+MONEY_COLUMNS = {"amount", "price", "advance"}
+
+
+def read_chunks(file, file_name, chunksize=IMPORT_CHUNK_SIZE):
+    """Yield the uploaded file as string-typed DataFrame chunks."""
+    if file_name.lower().endswith((".xlsx", ".xls")):
+        # Excel can't be read incrementally; chunk it after loading (needs openpyxl)
+        df = pd.read_excel(file, dtype=str)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+    else:
+        yield from pd.read_csv(file, dtype=str, chunksize=chunksize)
+
+
+def coerce_chunk(table, chunk):
+    """Normalize headers and types of one chunk; return (valid rows, rejected row count)."""
+    spec = IMPORT_COLUMNS[table]
+    chunk = chunk.rename(columns=lambda c: str(c).strip().lower().replace(" ", "_"))
+    missing = [c for c in spec["required"] if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Missing column(s) for {table}: {', '.join(missing)}")
+
+    df = chunk.reindex(columns=spec["required"] + spec["optional"]).astype("string")
+    for column in df.columns:
+        if column in DATE_COLUMNS:
+            df[column] = to_db(df[column])
+        elif column in MONEY_COLUMNS:
+            df[column] = pd.to_numeric(df[column].str.replace(",", "", regex=False), errors="coerce").round(2)
+        elif column == "order_id":
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int64")
+        else:
+            df[column] = df[column].str.strip()
+
+    if table == "orders":
+        df["advance"] = df["advance"].fillna(0)
+        df["pending_balance"] = df["price"] - df["advance"]
+        df["delivered"] = False
+
+    valid, problems = split_valid(table, df, sealed_date(table))
+    return valid, problems["row"].nunique()
+
+
+def import_file(table, file, file_name):
+    """Stream a file into `table`, one bulk insert per chunk. Returns (imported, rejected)."""
+    imported = rejected = 0
+    for chunk in read_chunks(file, file_name):
+        valid, bad = coerce_chunk(table, chunk)
+        if not valid.empty:
+            insert_rows(table, to_records(valid))
+        imported += len(valid)
+        rejected += bad
+    return imported, rejected
+
+
+def iter_csv(table, start=None, end=None):
+    """Yield a table (or a date range of it) as CSV text, one page at a time."""
+    header = True
+    for chunk in iter_table_pages(table, start=start, end=end):
+        yield chunk.to_csv(index=False, header=header)
+        header = False
+
+
+def export_csv(table, start=None, end=None):
+    """CSV export written to a temp file, so only one page is ever held as a DataFrame.
+
+    Returns the file opened for reading (a BufferedReader, which st.download_button
+    accepts); it is already unlinked, so it goes away once closed.
+    """
+    with tempfile.NamedTemporaryFile(mode="wb", suffix=".csv", delete=False) as out:
+        for text in iter_csv(table, start, end):
+            out.write(text.encode("utf-8"))
+    try:
+        return open(out.name, "rb")
+    finally:
+        os.unlink(out.name)
+
+
+def import_export_panel(tables, key):
+    """Import / export controls for the given tables."""
+    with st.expander("Import / Export"):
+        table = tables[0] if len(tables) == 1 else st.selectbox("Table", tables, key=f"{key}_table")
+
+        spec = IMPORT_COLUMNS[table]
+        st.caption(f"Columns: {', '.join(spec['required'])} (optional: {', '.join(spec['optional'])})")
+        upload = st.file_uploader("Import CSV or Excel", type=["csv", "xlsx"], key=f"{key}_upload")
+        if upload is not None and st.button("Import", key=f"{key}_import"):
+            try:
+                imported, rejected = import_file(table, upload, upload.name)
+                st.success(f"Imported {imported} row(s) into {table}.")
+                if rejected:
+                    st.warning(f"Skipped {rejected} row(s) with missing or invalid values.")
+            except (ValueError, ImportError) as e:
+                # ImportError: Excel files need openpyxl
+                st.error(str(e))
+
+        date_range = st.date_input("Export date range (optional)", value=(), key=f"{key}_export_dates")
+        start = date_range[0].isoformat() if len(date_range) > 0 else None
+        end = date_range[1].isoformat() if len(date_range) > 1 else None
+        st.download_button(
+            "Export CSV",
+            data=lambda: export_csv(table, start, end),
+            file_name=f"{table}.csv",
+            mime="text/csv",
+            key=f"{key}_export",
+        )
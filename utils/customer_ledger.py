@@ -0,0 +1,107 @@
+"""Per-customer receivables, joined from open orders and completed income.
+
+Built once per orders/income version and keyed by normalized customer name,
+so "what does X owe / what have they paid" is a dict lookup rather than a
+scan of both frames.  Amounts stay in integer paise.
+"""
+import re
+from collections import namedtuple
+import pandas as pd
+
+_SPACE_RE = re.compile(r"\s+")
+
+CustomerBalance = namedtuple("CustomerBalance", [
+    "name", "open_orders", "outstanding", "advance_held",
+    "payments", "lifetime_revenue", "last_order_date", "last_payment_date",
+])
+
+
+def normalize_name(name):
+    """Case- and whitespace-insensitive key, so 'Priya  Sharma' and 'priya sharma' are one customer."""
+    if name is None or name != name:
+        return ""
+    return _SPACE_RE.sub(" ", str(name)).strip().casefold()
+
+
+def _keys(column):
+    # customers are categoricals, so this normalizes each distinct name once
+    return column.astype("category").map(normalize_name).astype(object).fillna("")
+
+
+class CustomerLedger:
+    """Outstanding balance, lifetime revenue and last order date per customer."""
+
+    def __init__(self, orders, income):
+        orders = orders.reindex(columns=["order_id", "delivery_date", "customer", "advance", "pending_balance"])
+        income = income.reindex(columns=["income_id", "order_id", "date", "customer", "amount"])
+        order_keys, income_keys = _keys(orders["customer"]), _keys(income["customer"])
+
+        owed = orders.groupby(order_keys).agg(
+            open_orders=("order_id", "size"),
+            outstanding=("pending_balance", "sum"),
+            advance_held=("advance", "sum"),
+            last_open_order=("delivery_date", "max"),
+        )
+        paid = income.groupby(income_keys).agg(
+            payments=("income_id", "size"),
+            lifetime_revenue=("amount", "sum"),
+            last_payment_date=("date", "max"),
+        )
+        # settled orders are dated by their payment; open ones by delivery
+        settled = income[income["order_id"].notna()].groupby(income_keys)["date"].max().rename("last_settled_order")
+
+        # frames come newest first, so the spelling on the latest order wins as the display name
+        names = pd.concat([
+            pd.Series(orders["customer"].astype(object).to_numpy(), index=order_keys.to_numpy()),
+            pd.Series(income["customer"].astype(object).to_numpy(), index=income_keys.to_numpy()),
+        ])
+        names = names[~names.index.duplicated(keep="first")].rename("name")
+
+        table = pd.concat([names, owed, paid, settled], axis=1)
+        table = table[table.index != ""]
+        for column in ["open_orders", "outstanding", "advance_held", "payments", "lifetime_revenue"]:
+            table[column] = table[column].fillna(0).astype("int64")
+        # either side is all-NaN (float) when there are no orders or no income yet
+        table["last_order_date"] = pd.concat([pd.to_datetime(table["last_open_order"]),
+                                              pd.to_datetime(table["last_settled_order"])], axis=1).max(axis=1)
+        self.table = (table.drop(columns=["last_open_order", "last_settled_order"])
+                      .sort_values(["outstanding", "lifetime_revenue"], ascending=False))
+        self.table.index.name = "key"
+
+        self._balances = {key: CustomerBalance(*row) for key, row in
+                          zip(self.table.index, self.table[list(CustomerBalance._fields)].itertuples(index=False))}
+        self._order_rows = order_keys.groupby(order_keys).groups
+        self._income_rows = income_keys.groupby(income_keys).groups
+        self._orders, self._income = orders, income
+
+    def __len__(self):
+        return len(self._balances)
+
+    def __contains__(self, name):
+        return normalize_name(name) in self._balances
+
+    def get(self, name):
+        """CustomerBalance for a customer name (any spelling/case), or None."""
+        return self._balances.get(normalize_name(name))
+
+    def outstanding(self, name):
+        balance = self.get(name)
+        return balance.outstanding if balance else 0
+
+    def lifetime_revenue(self, name):
+        balance = self.get(name)
+        return balance.lifetime_revenue if balance else 0
+
+    def last_order_date(self, name):
+        balance = self.get(name)
+        return balance.last_order_date if balance else None
+
+    def orders_of(self, name):
+        """The customer's open orders."""
+        labels = self._order_rows.get(normalize_name(name), [])
+        return self._orders.loc[labels]
+
+    def payments_of(self, name):
+        """The customer's income rows."""
+        labels = self._income_rows.get(normalize_name(name), [])
+        return self._income.loc[labels]
@@ -0,0 +1,59 @@
+"""Whole-column date conversion between the DB (YYYY-MM-DD) and display (DD-MM-YYYY) formats.
+
+The format is detected once per column from a small sample, then the whole
+column is parsed in a single vectorized call.
+"""
+from datetime import date
+import pandas as pd
+
+DB_FORMAT = "%Y-%m-%d"
+DISPLAY_FORMAT = "%d-%m-%Y"
+# pandas format -> shape of the strings it applies to
+KNOWN_FORMATS = {
+    "ISO8601": r"\d{4}-\d{1,2}-\d{1,2}([ T].*)?",
+    DISPLAY_FORMAT: r"\d{1,2}-\d{1,2}-\d{4}",
+    "%Y/%m/%d": r"\d{4}/\d{1,2}/\d{1,2}",
+}
+SAMPLE_SIZE = 20
+
+
+def detect_format(values):
+    """Return the known format most of a sample of the column is written in, or None."""
+    sample = values.dropna().astype(str)
+    sample = sample[sample != ""].head(SAMPLE_SIZE)
+    if sample.empty:
+        return "ISO8601"
+    counts = {fmt: int(sample.str.fullmatch(pattern).sum()) for fmt, pattern in KNOWN_FORMATS.items()}
+    fmt = max(counts, key=counts.get)
+    return fmt if counts[fmt] else None
+
+
+def parse_dates(values):
+    """Column of strings / date objects -> datetime64 Series (NaT where missing or invalid)."""
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    first = values.dropna()
+    if not first.empty and isinstance(first.iloc[0], (date, pd.Timestamp)):
+        return pd.to_datetime(values, errors="coerce")
+    fmt = detect_format(values)
+    if fmt is None:
+        # unrecognised shapes: fall back to per-value parsing, day first as displayed
+        return pd.to_datetime(values, format="mixed", dayfirst=True, errors="coerce")
+    return pd.to_datetime(values, format=fmt, errors="coerce")
+
+
+def to_display(values):
+    """Column -> DD-MM-YYYY strings, "" where missing."""
+    return parse_dates(values).dt.strftime(DISPLAY_FORMAT).fillna("")
+
+
+def to_db(values):
+    """Column -> YYYY-MM-DD strings, None where missing, ready to send to the DB."""
+    iso = parse_dates(values).dt.strftime(DB_FORMAT)
+    return iso.astype(object).where(iso.notna(), None)
+
+
+def to_date_objects(values):
+    """Column -> python date objects (NaT where missing), for comparisons with st.date_input."""
+    return parse_dates(values).dt.date
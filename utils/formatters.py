@@ -1,4 +1,5 @@
 from datetime import datetime
+import pandas as pd
 
 def format_date_str(date_str):
     """Convert date string to DD-MM-YYYY regardless of input format."""
@@ -21,3 +22,10 @@ def parse_date_str(date_str):
         return None
     return datetime.strptime(str(date_str), "%d-%m-%Y")
 
+
+
+def format_money(paise):
+    """Integer paise -> rupee string with two decimals, e.g. 123456 -> '1,234.56'."""
+    if paise is None or pd.isna(paise):  # None, NaN or pd.NA (nullable Int64)
+        return ""
+    return f"{int(paise) / 100:,.2f}"
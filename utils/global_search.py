@@ -0,0 +1,65 @@
+"""Sidebar search box over orders, income and expenses.
+
+Picking a result switches to that record's page: an order opens in the
+Orders details panel, an income or expense row opens its grid page with the
+row highlighted.
+"""
+import streamlit as st
+
+RESULTS_PER_TABLE = 8
+# table -> (page title, date column shown in the result)
+RESULT_PAGES = {
+    "orders": ("Orders", "delivery_date"),
+    "income": ("Completed Orders", "date"),
+    "expenses": ("Expenses", "date"),
+}
+
+
+def search_box(pages, container):
+    """Render the search box in container; pages maps page titles to their st.Page."""
+    query = container.text_input("Search", key="global_search", placeholder="Customer, item, comment, month…")
+    if not query.strip():
+        return
+
+    # the data layer (and pandas) only load once someone searches
+    from supabasedbutil import search_records
+    results = search_records(query, RESULTS_PER_TABLE)
+    if not any(len(rows) for rows in results.values()):
+        container.caption("No matches.")
+        return
+    for table, rows in results.items():
+        title, _ = RESULT_PAGES[table]
+        for row_id, row in rows.iterrows():
+            if container.button(_label(table, row), key=f"search_{table}_{row_id}", width="stretch"):
+                _open(table, row)
+                st.switch_page(pages[title])
+
+
+def _label(table, row):
+    from utils.formatters import format_money
+    when = row[RESULT_PAGES[table][1]].strftime("%d-%m-%Y")
+    if table == "orders":
+        return f"Order #{row.name} · {when} · {row['customer']} · {row['item']}"
+    if table == "income":
+        return f"Income · {when} · {row['customer']} · ₹{format_money(row['amount'])}"
+    return f"Expense · {when} · {row['category']} · ₹{format_money(row['amount'])}"
+
+
+def _open(table, row):
+    """Set up the session so the record's page opens on it; rows are indexed by their id."""
+    from supabasedbutil import count_rows, row_position
+    from utils.aggrid_utils import GRID_PAGE_SIZE
+
+    if table == "orders":
+        row = row.copy()
+        row["delivery_display"] = row["delivery_date"].strftime("%d-%m-%Y")
+        st.session_state["selected_order"] = row
+        st.session_state["editing_order"] = None
+        return
+    position = row_position(table, row.name)
+    if position is None:
+        return
+    # the grid's page picker is keyed by its page count (see grid_page)
+    pages = max((count_rows(table) - 1) // GRID_PAGE_SIZE + 1, 1)
+    st.session_state[f"grid_page_{table}_{pages}"] = position // GRID_PAGE_SIZE + 1
+    st.session_state[f"grid_focus_{table}"] = int(row.name)
@@ -0,0 +1,145 @@
+"""Per-rerun performance counters: DB round trips, rows, bytes and timing spans.
+
+app.py starts a RerunStats at the top of each script run; everything below
+records into it through a context variable, so concurrent sessions don't mix.
+"""
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+import streamlit as st
+
+# one JSON line per rerun on stderr; PERF_LOG_LEVEL=WARNING silences it
+logger = logging.getLogger("finance_tracker.perf")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(os.environ.get("PERF_LOG_LEVEL", "INFO"))
+    logger.propagate = False
+
+SLOWEST_SPANS = 8
+
+_current = ContextVar("rerun_stats", default=None)
+
+
+class RerunStats:
+    def __init__(self, measure_bytes=False):
+        self.started = time.perf_counter()
+        self.measure_bytes = measure_bytes
+        self.round_trips = 0
+        self.rows = 0
+        self.bytes = 0
+        self.calls = {}
+        self.spans = []
+
+    def add_span(self, name, seconds):
+        self.spans.append((name, seconds))
+        count, total = self.calls.get(name, (0, 0.0))
+        self.calls[name] = (count + 1, total + seconds)
+
+    def slowest(self, n=SLOWEST_SPANS):
+        return sorted(self.spans, key=lambda s: s[1], reverse=True)[:n]
+
+    def as_dict(self):
+        return {
+            "elapsed_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "round_trips": self.round_trips,
+            "rows": self.rows,
+            "bytes": self.bytes if self.measure_bytes else None,
+            "calls": {name: {"count": c, "total_ms": round(t * 1000, 1)} for name, (c, t) in self.calls.items()},
+            "slowest": [{"span": name, "ms": round(t * 1000, 1)} for name, t in self.slowest()],
+        }
+
+
+def start_rerun(measure_bytes=False):
+    stats = RerunStats(measure_bytes)
+    _current.set(stats)
+    return stats
+
+
+def current_stats():
+    return _current.get()
+
+
+@contextmanager
+def span(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _current.get()
+        if stats is not None:
+            stats.add_span(name, time.perf_counter() - start)
+
+
+def instrumented(fn, prefix="db"):
+    """Wrap fn so each call is recorded as a span (generators: until exhausted)."""
+    name = f"{prefix}.{fn.__name__}"
+
+    if inspect.isgeneratorfunction(fn):
+        @functools.wraps(fn)
+        def gen_wrapper(*args, **kwargs):
+            with span(name):
+                yield from fn(*args, **kwargs)
+        return gen_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with span(name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def instrument_module(namespace, prefix="db"):
+    """Wrap every plain function defined in a module, in place."""
+    module = namespace["__name__"]
+    for attr, value in list(namespace.items()):
+        if inspect.isfunction(value) and value.__module__ == module:
+            namespace[attr] = instrumented(value, prefix)
+
+
+class InstrumentedBackend:
+    """Counts every backend call as one round trip, with the rows (and bytes) it returned."""
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def __getattr__(self, attr):
+        method = getattr(self._backend, attr)
+        if not callable(method):
+            return method
+
+        @functools.wraps(method)
+        def call(*args, **kwargs):
+            with span(f"backend.{attr}"):
+                result = method(*args, **kwargs)
+            stats = _current.get()
+            if stats is not None:
+                stats.round_trips += 1
+                if isinstance(result, list):
+                    stats.rows += len(result)
+                    if stats.measure_bytes:
+                        stats.bytes += len(json.dumps(result, default=str))
+            return result
+        return call
+
+
+def log_rerun(stats, page=None):
+    logger.info(json.dumps({"event": "rerun", "page": page, **stats.as_dict()}))
+
+
+def debug_panel(container, stats):
+    """Render the per-rerun numbers into a (sidebar) container."""
+    data = stats.as_dict()
+    with container.expander("Debug: this rerun", expanded=True):
+        c1, c2 = st.columns(2)
+        c1.metric("DB round trips", data["round_trips"])
+        c2.metric("Rows fetched", data["rows"])
+        c1.metric("KB fetched", round(data["bytes"] / 1024, 1) if data["bytes"] is not None else "–")
+        c2.metric("Rerun ms", data["elapsed_ms"])
+        st.dataframe(data["slowest"], hide_index=True, width="stretch")
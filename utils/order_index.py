@@ -0,0 +1,64 @@
+"""In-memory search index over the orders frame.
+
+Built once per orders version so each rerun only looks up the rows it is
+about to render instead of rescanning the frame.
+"""
+import numpy as np
+import pandas as pd
+from utils.dates import to_date_objects, to_display
+from utils.tokens import prefixed, tokenize
+
+SEARCH_COLUMNS = ["customer", "item", "order_id"]
+
+
+class OrderIndex:
+    """Orders sorted by delivery date, with a token -> row positions map for search."""
+
+    def __init__(self, df_orders):
+        df = df_orders.copy()
+        for column in ["delivery_date"] + SEARCH_COLUMNS:
+            if column not in df.columns:
+                # an empty table comes back without columns
+                df[column] = pd.Series(dtype=object)
+        df["delivery_display"] = to_display(df["delivery_date"])
+        df["delivery_date"] = to_date_objects(df["delivery_date"])
+        # rows with an unparseable date sort last and are left out of both lists
+        self.df = df.sort_values(by="delivery_date", ascending=True, na_position="last").reset_index(drop=True)
+
+        dates = pd.to_datetime(self.df["delivery_date"])
+        self.dated_rows = int(dates.notna().sum())
+        self._dates = dates.to_numpy()[:self.dated_rows]
+
+        postings = {}
+        for column in SEARCH_COLUMNS:
+            for pos, value in enumerate(self.df[column].tolist()):
+                for token in tokenize(value):
+                    postings.setdefault(token, set()).add(pos)
+        self._postings = {token: np.fromiter(sorted(rows), dtype=np.int64) for token, rows in postings.items()}
+        self._vocab = sorted(self._postings)
+
+    def __len__(self):
+        return len(self.df)
+
+    def date_position(self, day):
+        """First row position delivered on or after day."""
+        return int(np.searchsorted(self._dates, np.datetime64(day, "ns"), side="left"))
+
+    def search(self, text="", start=None, end=None):
+        """Row positions (ascending by delivery date) matching every word of text as a prefix,
+        delivered between start and end inclusive."""
+        lo = self.date_position(start) if start else 0
+        hi = int(np.searchsorted(self._dates, np.datetime64(end, "ns"), side="right")) if end else self.dated_rows
+        positions = np.arange(lo, hi, dtype=np.int64)
+
+        for word in tokenize(text):
+            positions = np.intersect1d(positions, self._prefix_matches(word), assume_unique=True)
+            if positions.size == 0:
+                break
+        return positions
+
+    def _prefix_matches(self, word):
+        matches = [self._postings[token] for token in prefixed(self._vocab, word)]
+        if not matches:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(matches))
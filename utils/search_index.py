@@ -0,0 +1,97 @@
+"""Inverted index for the global search box, kept up to date row by row.
+
+Each table's index maps lower-case tokens of its text columns (plus the month
+name and year of its date, so "sharma march" works) to row ids. When the
+synced frame changes, only rows whose updated_at moved, and rows that
+disappeared, are re-tokenized, so keeping the index current costs as much as
+the delta rather than the whole history.
+"""
+import threading
+import pandas as pd
+from utils.tokens import TOKEN_RE, prefixed, tokenize
+
+
+class TableSearchIndex:
+    """token -> row ids for one table; search() matches every word as a token prefix."""
+
+    def __init__(self, columns, date_column, id_column):
+        self.columns = columns
+        self.date_column = date_column
+        self.id_column = id_column
+        self.df = None
+        self._source = None
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._doc_tokens = {}
+        self._stamps = pd.Series(dtype=object)
+        self._vocab = []
+
+    def refresh(self, df):
+        """Bring the index in line with df (the table's synced frame).
+
+        synced_table hands back the same frame until a sync changes it, so an
+        unchanged table costs one identity check. A frame without the id and
+        updated_at columns (a table with no rows) empties the index.
+        """
+        with self._lock:
+            if df is self._source:
+                return
+            source = df
+            if self.id_column not in df.columns or "updated_at" not in df.columns:
+                df = pd.DataFrame(columns=[self.id_column, "updated_at", self.date_column, *self.columns])
+            # rows still in the write-behind queue (negative ids) aren't searchable yet
+            df = df[pd.to_numeric(df[self.id_column]) > 0]
+            stamps = pd.Series(df["updated_at"].to_numpy(), index=df[self.id_column].to_numpy())
+            known = self._stamps.reindex(stamps.index)
+            changed = stamps.index[(known.isna() | (known != stamps)).to_numpy()]
+            removed = self._stamps.index.difference(stamps.index)
+
+            for row_id in removed.union(changed):
+                for token in self._doc_tokens.pop(row_id, ()):
+                    ids = self._postings.get(token)
+                    if ids is not None:
+                        ids.discard(row_id)
+                        if not ids:
+                            del self._postings[token]
+            if len(changed):
+                self._add(df[df[self.id_column].isin(changed)])
+            if len(changed) or len(removed):
+                self._vocab = sorted(self._postings)
+            self._stamps = stamps
+            self.df = df.set_index(self.id_column, drop=False).rename_axis(None)
+            # only now: a frame that failed part way through is indexed again on the next call
+            self._source = source
+
+    def _add(self, rows):
+        texts = [rows[column].astype("string").str.lower() for column in self.columns]
+        texts.append(pd.to_datetime(rows[self.date_column]).dt.strftime("%B %Y").str.lower().astype("string"))
+        tokens = pd.concat([
+            pd.DataFrame({"id": rows[self.id_column].to_numpy(), "token": text.str.findall(TOKEN_RE).to_numpy()})
+            for text in texts
+        ]).explode("token").dropna().drop_duplicates()
+        for token, ids in tokens.groupby("token")["id"]:
+            self._postings.setdefault(token, set()).update(ids.tolist())
+        for row_id, row_tokens in tokens.groupby("id")["token"]:
+            self._doc_tokens[row_id] = tuple(row_tokens)
+
+    def search(self, text, limit=None):
+        """Rows matching every word of text, newest first."""
+        with self._lock:
+            words = tokenize(text)
+            if not words or self.df is None:
+                return self.df.iloc[0:0] if self.df is not None else pd.DataFrame()
+            ids = None
+            for word in words:
+                matches = self._prefix_matches(word)
+                ids = matches if ids is None else ids & matches
+                if not ids:
+                    break
+            rows = self.df.loc[sorted(ids)] if ids else self.df.iloc[0:0]
+            rows = rows.sort_values([self.date_column, self.id_column], ascending=False)
+            return rows.head(limit) if limit else rows
+
+    def _prefix_matches(self, word):
+        ids = set()
+        for token in prefixed(self._vocab, word):
+            ids |= self._postings[token]
+        return ids
@@ -0,0 +1,59 @@
+"""Column definitions of the app's tables, mirroring DBSchema.txt.
+
+Each column has a kind that decides its in-memory dtype:
+  id         SERIAL / INT keys      -> int32 (Int32 when nullable)
+  date       DATE                   -> datetime64
+  timestamp  TIMESTAMPTZ            -> datetime64, UTC
+  money      NUMERIC(12,2)          -> int64 paise (Int64 when nullable)
+  category   short, repetitive text -> category
+  text       free text              -> string
+  bool       BOOLEAN                -> bool
+
+length is the VARCHAR limit of text columns, checked before writes (see
+utils/validation.py).
+"""
+from collections import namedtuple
+
+Column = namedtuple("Column", ["kind", "nullable", "length"], defaults=[True, None])
+
+TABLE_SCHEMAS = {
+    "expenses": {
+        "expense_id": Column("id", nullable=False),
+        "date": Column("date", nullable=False),
+        "category": Column("category", nullable=False, length=100),
+        "amount": Column("money", nullable=False),
+        "comment": Column("text"),
+        "updated_at": Column("timestamp"),
+    },
+    "income": {
+        "income_id": Column("id", nullable=False),
+        "order_id": Column("id"),
+        "date": Column("date", nullable=False),
+        "customer": Column("category", nullable=False, length=100),
+        "amount": Column("money", nullable=False),
+        "payment_method": Column("category", nullable=False, length=50),
+        "comment": Column("text"),
+        "updated_at": Column("timestamp"),
+    },
+    "orders": {
+        "order_id": Column("id", nullable=False),
+        "delivery_date": Column("date", nullable=False),
+        "customer": Column("category", nullable=False, length=100),
+        "item": Column("category", nullable=False, length=100),
+        "price": Column("money", nullable=False),
+        "advance": Column("money"),
+        "pending_balance": Column("money", nullable=False),
+        "description": Column("text"),
+        "delivered": Column("bool"),
+        "updated_at": Column("timestamp"),
+    },
+    "monthly_summary": {
+        "month": Column("date", nullable=False),
+        "total_expense": Column("money", nullable=False),
+        "total_income": Column("money", nullable=False),
+    },
+}
+
+
+def columns_of_kind(table, kind):
+    return [name for name, column in TABLE_SCHEMAS[table].items() if column.kind == kind]
@@ -0,0 +1,23 @@
+"""Tokenizing and prefix lookup shared by the in-memory search indexes.
+
+Text is split into lower-case runs of letters and digits; a search word
+matches every token it is a prefix of, found by bisecting the index's
+sorted vocabulary.
+"""
+import re
+from bisect import bisect_left
+
+TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(str(text).lower())
+
+
+def prefixed(vocab, word):
+    """Tokens of vocab (a sorted list) that start with word."""
+    i = bisect_left(vocab, word)
+    j = i
+    while j < len(vocab) and vocab[j].startswith(word):
+        j += 1
+    return vocab[i:j]
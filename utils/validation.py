@@ -0,0 +1,121 @@
+"""Checks a whole frame of rows against its table's schema before it is written.
+
+The checks come from the column definitions in utils/table_schema.py (which
+mirror DBSchema.txt): NOT NULL, dates and numbers that parse, non-negative
+money that fits NUMERIC(12,2), VARCHAR lengths, plus row rules such as
+orders.pending_balance = price - advance. Each check is one vectorized
+expression over a column, so a frame costs the same handful of operations
+however many rows it has, and every offending cell is reported at once.
+
+Values are checked as entered (grid cells, form fields, imported text), so
+dates may be DB or display strings and money is in rupees.
+
+Given sealed_through (see archive/), dates on or before it are rejected too:
+sealed periods are served from the archive, so rows written there would be
+lost on the next full load.
+"""
+import pandas as pd
+from utils.dates import parse_dates
+from utils.table_schema import TABLE_SCHEMAS
+
+# NUMERIC(12,2): ten digits before the decimal point
+MONEY_LIMIT = 10 ** 10
+
+
+class ValidationError(ValueError):
+    """Raised for rows that fail validate_frame; .problems holds every offending cell."""
+
+    def __init__(self, problems):
+        self.problems = problems
+        messages = (problems["column"] + " " + problems["message"]).drop_duplicates()
+        super().__init__("; ".join(messages))
+
+
+def _pending_balance(numbers):
+    expected = numbers["price"] - numbers["advance"].fillna(0)
+    return (numbers["pending_balance"] - expected).abs() >= 0.005, "pending_balance", "must equal price - advance"
+
+
+# table -> rules over the parsed money columns: numbers -> (bad rows, column, message)
+ROW_RULES = {
+    "orders": [(["price", "advance", "pending_balance"], _pending_balance)],
+}
+
+
+def _blank(values):
+    return values.isna() | values.astype("string").str.strip().eq("").fillna(True)
+
+
+def _to_number(values):
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype("Float64")
+    text = values.astype("string").str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(text, errors="coerce").astype("Float64")
+
+
+def validate_frame(table, df, sealed_through=None):
+    """Problems with df's rows as a frame of (row, column, message), one per offending cell.
+
+    row is df's index label. Only columns present in df are type-checked;
+    a NOT NULL column missing from df counts as blank in every row. Keys and
+    timestamps the database assigns are not required. With sealed_through
+    (an ISO date), date columns must be later than it.
+    """
+    found = []
+    numbers = {}
+    for name, column in TABLE_SCHEMAS[table].items():
+        if column.kind == "timestamp":
+            continue
+        if name not in df.columns:
+            if not column.nullable and column.kind != "id":
+                found.append((pd.Series(True, index=df.index), name, "is required"))
+            continue
+        values = df[name]
+        blank = _blank(values)
+        if not column.nullable and column.kind != "id":
+            found.append((blank, name, "is required"))
+
+        if column.kind == "date":
+            dates = parse_dates(values)
+            found.append((~blank & dates.isna().to_numpy(), name, "is not a valid date"))
+            if sealed_through is not None:
+                sealed = (dates <= pd.Timestamp(sealed_through)).to_numpy()
+                found.append((pd.Series(sealed, index=df.index), name, f"is in a sealed period (through {sealed_through})"))
+        elif column.kind == "money":
+            number = numbers[name] = _to_number(values)
+            found.append((~blank & number.isna(), name, "is not a number"))
+            found.append(((number < 0).fillna(False), name, "must not be negative"))
+            found.append(((number >= MONEY_LIMIT).fillna(False), name, "is too large"))
+        elif column.kind == "id":
+            number = _to_number(values)
+            found.append((~blank & (number.isna() | (number % 1 != 0).fillna(True)), name, "is not a whole number"))
+        elif column.length is not None:
+            too_long = values.astype("string").str.strip().str.len() > column.length
+            found.append((too_long.fillna(False), name, f"is longer than {column.length} characters"))
+
+    for columns, rule in ROW_RULES.get(table, []):
+        if all(name in numbers for name in columns):
+            bad, name, message = rule(numbers)
+            found.append((bad.fillna(False), name, message))
+
+    problems = [
+        pd.DataFrame({"row": df.index[mask.to_numpy(dtype=bool)], "column": name, "message": message})
+        for mask, name, message in found
+        if mask.any()
+    ]
+    if not problems:
+        return pd.DataFrame({"row": pd.Series(dtype=df.index.dtype), "column": pd.Series(dtype=str), "message": pd.Series(dtype=str)})
+    return pd.concat(problems, ignore_index=True)
+
+
+def split_valid(table, df, sealed_through=None):
+    """(rows of df that pass validate_frame, problems with the others)."""
+    problems = validate_frame(table, df, sealed_through)
+    return df[~df.index.isin(problems["row"])], problems
+
+
+def require_valid(table, df, sealed_through=None):
+    """Raise ValidationError unless every row of df passes validate_frame."""
+    problems = validate_frame(table, df, sealed_through)
+    if len(problems):
+        raise ValidationError(problems)
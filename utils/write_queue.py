@@ -0,0 +1,182 @@
+"""Write-behind queue for new rows, journaled to a local SQLite file.
+
+A form submit only appends to the journal, so it returns at once even when
+the database is slow or unreachable.  A background thread flushes the journal
+in batches, one insert per table, retrying failed batches with exponential
+backoff.  Entries survive a restart and are flushed when the app comes back.
+
+Delivery is at-least-once: a crash between a successful insert and clearing
+its journal entries sends those rows again. Entries being sent are marked
+in_flight, and can't be cancelled until the send is over.
+"""
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger("finance_tracker.write_queue")
+
+FLUSH_BATCH = 200
+RETRY_BASE_SECONDS = 2
+RETRY_MAX_SECONDS = 300
+# after this many failed attempts an entry waits for a manual retry
+MAX_ATTEMPTS = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_writes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    row_json TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    in_flight INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+class InFlightError(RuntimeError):
+    """Raised by cancel() for entries a flush is sending right now; .ids lists them."""
+
+    def __init__(self, ids):
+        self.ids = ids
+        super().__init__(f"{len(ids)} entr{'y is' if len(ids) == 1 else 'ies are'} being saved right now; try again in a moment.")
+
+
+def backoff_seconds(attempts):
+    """Delay before retry number attempts: doubling from RETRY_BASE_SECONDS, capped, with jitter."""
+    delay = min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+
+class WriteQueue:
+    """Journal of rows waiting to be inserted, and the worker that flushes it.
+
+    flush(table, rows) does the insert and raises on failure; on_change(table)
+    is called whenever the pending rows of a table change.
+    """
+
+    def __init__(self, path, flush, on_change=None):
+        self._flush = flush
+        self._on_change = on_change or (lambda table: None)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(pending_writes)")}
+        if "in_flight" not in columns:  # journals written before in_flight existed
+            self._conn.execute("ALTER TABLE pending_writes ADD COLUMN in_flight INTEGER NOT NULL DEFAULT 0")
+        # a send cut short by a restart is retried
+        self._conn.execute("UPDATE pending_writes SET in_flight = 0")
+        self._worker = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._worker.start()
+
+    def enqueue(self, table, row):
+        """Journal one row for insertion; returns its journal id."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO pending_writes (table_name, row_json, created_at) VALUES (?, ?, ?)",
+                (table, json.dumps(row, default=str), time.time()))
+        self._on_change(table)
+        self._wake.set()
+        return cursor.lastrowid
+
+    def cancel(self, table, ids):
+        """Drop journal entries that haven't been flushed yet.
+
+        Raises InFlightError, dropping nothing, if any of them is being sent.
+        """
+        ids = [int(i) for i in ids]
+        placeholders = ", ".join("?" * len(ids))
+        with self._lock:
+            in_flight = [id_ for (id_,) in self._conn.execute(
+                f"SELECT id FROM pending_writes WHERE table_name = ? AND in_flight AND id IN ({placeholders})",
+                [table, *ids])]
+            if in_flight:
+                raise InFlightError(in_flight)
+            self._conn.execute(
+                f"DELETE FROM pending_writes WHERE table_name = ? AND id IN ({placeholders})", [table, *ids])
+        self._on_change(table)
+
+    def pending(self, table):
+        """(journal id, row, error) for every unflushed row of a table, oldest first."""
+        with self._lock:
+            entries = self._conn.execute(
+                "SELECT id, row_json, last_error FROM pending_writes WHERE table_name = ? ORDER BY id",
+                (table,)).fetchall()
+        return [(id_, json.loads(row), error) for id_, row, error in entries]
+
+    def counts(self):
+        """{"pending": n, "failed": n} across all tables; failed entries are waiting for retry()."""
+        with self._lock:
+            pending, failed = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(attempts >= ?), 0) FROM pending_writes", (MAX_ATTEMPTS,)).fetchone()
+        return {"pending": pending, "failed": failed}
+
+    def retry(self):
+        """Make every entry due now, including ones that gave up after MAX_ATTEMPTS."""
+        with self._lock:
+            self._conn.execute("UPDATE pending_writes SET attempts = 0, next_attempt_at = 0")
+        self._wake.set()
+
+    def flush_due(self):
+        """Flush one batch of due entries per table; returns the number of rows written."""
+        with self._lock:
+            entries = self._conn.execute(
+                "SELECT id, table_name, row_json, attempts FROM pending_writes "
+                "WHERE next_attempt_at <= ? AND attempts < ? ORDER BY id LIMIT ?",
+                (time.time(), MAX_ATTEMPTS, FLUSH_BATCH)).fetchall()
+            # claimed under the lock, so cancel() can't drop a row that is about to be inserted
+            self._conn.execute(
+                f"UPDATE pending_writes SET in_flight = 1 WHERE id IN ({', '.join('?' * len(entries))})",
+                [entry[0] for entry in entries])
+        batches = {}
+        for entry in entries:
+            batches.setdefault(entry[1], []).append(entry)
+
+        written = 0
+        for table, batch in batches.items():
+            ids = [entry[0] for entry in batch]
+            placeholders = ", ".join("?" * len(ids))
+            try:
+                self._flush(table, [json.loads(entry[2]) for entry in batch])
+            except Exception as exc:
+                attempts = max(entry[3] for entry in batch) + 1
+                logger.warning("flushing %d %s row(s) failed (attempt %d): %s", len(ids), table, attempts, exc)
+                with self._lock:
+                    self._conn.execute(
+                        f"UPDATE pending_writes SET attempts = ?, last_error = ?, in_flight = 0 WHERE id IN ({placeholders})",
+                        [attempts, str(exc), *ids])
+                    # the whole table backs off together, so its rows are retried as one batch
+                    self._conn.execute(
+                        "UPDATE pending_writes SET next_attempt_at = ? WHERE table_name = ?",
+                        (time.time() + backoff_seconds(attempts), table))
+                continue
+            with self._lock:
+                self._conn.execute(f"DELETE FROM pending_writes WHERE id IN ({placeholders})", ids)
+            written += len(ids)
+            self._on_change(table)
+        return written
+
+    def _next_due_in(self):
+        with self._lock:
+            (due,) = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM pending_writes WHERE attempts < ?", (MAX_ATTEMPTS,)).fetchone()
+        return None if due is None else max(due - time.time(), 0)
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                # keep going while full batches come back, then sleep until the next retry is due
+                while self.flush_due() >= FLUSH_BATCH:
+                    pass
+                timeout = self._next_due_in()
+            except Exception:
+                logger.exception("write-behind worker")
+                timeout = RETRY_BASE_SECONDS
+            self._wake.wait(timeout)